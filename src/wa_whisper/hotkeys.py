@@ -2,15 +2,17 @@
 
 from __future__ import annotations
 
-import shutil
+import queue
 import subprocess
 import threading
+import time
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Callable, Dict, Optional, Tuple
 
 from pynput import keyboard
 
 from .log_utils import write_log
+from .proc_utils import tune_thread_scheduling, which
 from .recorder import Recorder, RecorderStartError, RecorderStats
 
 
@@ -18,21 +20,159 @@ class AudioMuteError(Exception):
     """Raised when system audio mute operations fail."""
 
 
+def _noop() -> None:
+    return None
+
+
+DEFAULT_MUTE_CACHE_TTL = 5.0
+
+
+class _MuteStateCache:
+    """Remember the pre-capture mute state per sink for a short TTL.
+
+    Reading the mute state forks `wpctl`/`pactl` on every key press; the value
+    rarely changes between captures, so it is cached until the TTL lapses or a
+    sink event reported by `pactl subscribe` invalidates it.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_MUTE_CACHE_TTL) -> None:
+        self._ttl = ttl
+        self._entries: Dict[str, Tuple[Optional[bool], float]] = {}
+        self._quiet_until = 0.0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Tuple[bool, Optional[bool]]:
+        """Return `(found, value)` for `key`, counting hits and misses."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                self.hits += 1
+                return True, entry[0]
+            self._entries.pop(key, None)
+            self.misses += 1
+            return False, None
+
+    def put(self, key: str, value: Optional[bool]) -> None:
+        if self._ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self._ttl)
+
+    def invalidate(self, key: str | None = None) -> None:
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def suppress_events(self, window: float) -> None:
+        """Ignore sink events for `window` seconds (our own set-mute calls)."""
+        with self._lock:
+            self._quiet_until = max(self._quiet_until, time.monotonic() + window)
+
+    def handle_sink_event(self) -> bool:
+        """Invalidate all entries unless the event was caused by us."""
+        with self._lock:
+            if time.monotonic() < self._quiet_until:
+                return False
+            self._entries.clear()
+            return True
+
+
+class _SinkEventWatcher:
+    """Invalidate the mute-state cache when `pactl subscribe` reports sink changes."""
+
+    def __init__(self, cache: _MuteStateCache, log_path: Path, pactl_bin: str) -> None:
+        self._cache = cache
+        self._pactl = pactl_bin
+        self._log_path = log_path
+        self._proc: subprocess.Popen[str] | None = None
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._proc is not None:
+            return
+        try:
+            self._proc = subprocess.Popen(
+                [self._pactl, "subscribe"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+            )
+        except OSError as exc:
+            write_log(f"Sink event watcher unavailable: {exc}", self._log_path)
+            self._proc = None
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        proc.terminate()
+        try:
+            proc.wait(timeout=1.0)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+    def _run(self) -> None:
+        proc = self._proc
+        if proc is None or proc.stdout is None:
+            return
+        for line in proc.stdout:
+            if " on sink " in line and self._cache.handle_sink_event():
+                write_log("Sink event received; mute-state cache invalidated", self._log_path)
+
+
 class AudioMuteController:
     """Mute desktop audio while recording to avoid feedback loops."""
 
-    def __init__(self, log_path: Path) -> None:
+    def __init__(
+        self,
+        log_path: Path,
+        *,
+        cache_ttl: float = DEFAULT_MUTE_CACHE_TTL,
+        on_disabled: Callable[[], None] | None = None,
+    ) -> None:
         self._log_path = log_path
+        self._on_disabled = on_disabled
+        self._cache = _MuteStateCache(cache_ttl)
+        self._watcher: _SinkEventWatcher | None = None
+        # Absolute binary paths keep subprocess on its vfork/posix_spawn fast path.
+        self._wpctl = which("wpctl")
+        self._pactl = which("pactl")
         self._strategy: _MuteStrategy | None = self._detect_strategy()
+        if self._strategy and cache_ttl > 0 and self._pactl:
+            self._watcher = _SinkEventWatcher(self._cache, log_path, self._pactl)
+            self._watcher.start()
 
     def _detect_strategy(self) -> "_MuteStrategy | None":
-        if shutil.which("wpctl"):
-            return _WpctlStrategy(self._log_path)
-        if shutil.which("pactl"):
-            return _PactlStrategy(self._log_path)
+        if self._wpctl:
+            return _WpctlStrategy(self._log_path, self._cache, self._wpctl)
+        if self._pactl:
+            return _PactlStrategy(self._log_path, self._cache, self._pactl)
         write_log("Auto-mute disabled: wpctl/pactl not found", self._log_path)
         return None
 
+    @property
+    def enabled(self) -> bool:
+        """Whether a mute strategy is available and has not failed."""
+        return self._strategy is not None
+
+    def refresh(self) -> None:
+        """Drop cached mute state so the next capture queries the sink again."""
+        self._cache.invalidate()
+
+    def close(self) -> None:
+        """Stop the sink event watcher."""
+        if self._watcher:
+            self._watcher.stop()
+            self._watcher = None
+
     def mute(self) -> None:
         if not self._strategy:
             return
@@ -40,7 +180,7 @@ class AudioMuteController:
             self._strategy.mute()
         except AudioMuteError as exc:
             write_log(f"Failed to mute audio: {exc}", self._log_path)
-            self._strategy = None
+            self._disable()
 
     def restore(self) -> None:
         if not self._strategy:
@@ -49,14 +189,27 @@ class AudioMuteController:
             self._strategy.restore()
         except AudioMuteError as exc:
             write_log(f"Failed to restore audio: {exc}", self._log_path)
-            self._strategy = None
+            self._disable()
+
+    def _disable(self) -> None:
+        self._strategy = None
+        if self._on_disabled:
+            self._on_disabled()
 
 
 class _MuteStrategy:
-    def __init__(self, log_path: Path) -> None:
+    # Sink events triggered by our own set-mute calls should not invalidate the cache.
+    _SELF_EVENT_WINDOW = 0.5
+    _PENDING_TIMEOUT = 2.0
+
+    def __init__(self, log_path: Path, cache: _MuteStateCache, binary: str) -> None:
         self._log_path = log_path
+        self._cache = cache
+        self._bin = binary
         self._active = False
         self._previously_muted: Optional[bool] = None
+        self._proc: subprocess.Popen[bytes] | None = None
+        self._proc_label = ""
 
     def mute(self) -> None:
         raise NotImplementedError
@@ -64,6 +217,54 @@ class _MuteStrategy:
     def restore(self) -> None:
         raise NotImplementedError
 
+    def _cache_key(self) -> str:
+        raise NotImplementedError
+
+    def _read_muted(self) -> Optional[bool]:
+        raise NotImplementedError
+
+    def _previous_mute_state(self) -> Optional[bool]:
+        key = self._cache_key()
+        found, value = self._cache.get(key)
+        if not found:
+            value = self._read_muted()
+            self._cache.put(key, value)
+        write_log(
+            f"Mute state cache {'hit' if found else 'miss'} "
+            f"(hits={self._cache.hits} misses={self._cache.misses})",
+            self._log_path,
+        )
+        return value
+
+    def _spawn(self, command: list[str], label: str) -> None:
+        """Launch `command` without waiting; `_join_pending` reaps it later."""
+        try:
+            self._proc = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        except OSError as exc:
+            raise AudioMuteError(f"{label} failed: {exc}") from exc
+        self._proc_label = label
+
+    def _join_pending(self) -> None:
+        """Wait for the outstanding mute command and surface its failure."""
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            _, stderr = proc.communicate(timeout=self._PENDING_TIMEOUT)
+        except subprocess.TimeoutExpired as exc:
+            proc.kill()
+            proc.communicate()
+            raise AudioMuteError(f"{self._proc_label} timed out") from exc
+        if proc.returncode != 0:
+            detail = stderr.decode("utf-8", "ignore").strip() if stderr else ""
+            raise AudioMuteError(
+                f"{self._proc_label} failed: exit status {proc.returncode}; stderr={detail}"
+            )
+
+    def _remember_restored_state(self) -> None:
+        # After restore the sink is back in its pre-capture state.
+        self._cache.put(self._cache_key(), self._previously_muted)
+
 
 class _WpctlStrategy(_MuteStrategy):
     _TARGET = "@DEFAULT_AUDIO_SINK@"
@@ -71,11 +272,9 @@ class _WpctlStrategy(_MuteStrategy):
     def mute(self) -> None:
         if self._active:
             return
-        self._previously_muted = self._read_muted()
-        try:
-            subprocess.run(["wpctl", "set-mute", self._TARGET, "1"], check=True)
-        except subprocess.CalledProcessError as exc:
-            raise AudioMuteError(f"wpctl mute failed: {exc}") from exc
+        self._previously_muted = self._previous_mute_state()
+        self._cache.suppress_events(self._SELF_EVENT_WINDOW)
+        self._spawn([self._bin, "set-mute", self._TARGET, "1"], "wpctl mute")
         self._active = True
         write_log("Muted system audio (wpctl)", self._log_path)
 
@@ -83,20 +282,27 @@ class _WpctlStrategy(_MuteStrategy):
         if not self._active:
             return
         try:
+            self._join_pending()
             if self._previously_muted is False:
-                subprocess.run(["wpctl", "set-mute", self._TARGET, "0"], check=True)
+                self._cache.suppress_events(self._SELF_EVENT_WINDOW)
+                subprocess.run([self._bin, "set-mute", self._TARGET, "0"], check=True)
                 write_log("Restored system audio (wpctl)", self._log_path)
             else:
                 write_log("Audio was muted before capture; left muted (wpctl)", self._log_path)
+            self._remember_restored_state()
         except subprocess.CalledProcessError as exc:
+            self._cache.invalidate(self._cache_key())
             raise AudioMuteError(f"wpctl restore failed: {exc}") from exc
         finally:
             self._active = False
             self._previously_muted = None
 
+    def _cache_key(self) -> str:
+        return self._TARGET
+
     def _read_muted(self) -> Optional[bool]:
         try:
-            output = subprocess.check_output(["wpctl", "get-volume", self._TARGET], text=True)
+            output = subprocess.check_output([self._bin, "get-volume", self._TARGET], text=True)
         except subprocess.CalledProcessError as exc:
             raise AudioMuteError(f"wpctl get-volume failed: {exc}") from exc
         normalized = output.strip().lower()
@@ -108,18 +314,16 @@ class _WpctlStrategy(_MuteStrategy):
 
 
 class _PactlStrategy(_MuteStrategy):
-    def __init__(self, log_path: Path) -> None:
-        super().__init__(log_path)
+    def __init__(self, log_path: Path, cache: _MuteStateCache, binary: str) -> None:
+        super().__init__(log_path, cache, binary)
         self._sink = self._detect_sink()
 
     def mute(self) -> None:
         if self._active:
             return
-        self._previously_muted = self._read_muted()
-        try:
-            subprocess.run(["pactl", "set-sink-mute", self._sink, "1"], check=True)
-        except subprocess.CalledProcessError as exc:
-            raise AudioMuteError(f"pactl mute failed: {exc}") from exc
+        self._previously_muted = self._previous_mute_state()
+        self._cache.suppress_events(self._SELF_EVENT_WINDOW)
+        self._spawn([self._bin, "set-sink-mute", self._sink, "1"], "pactl mute")
         self._active = True
         write_log(f"Muted system audio (pactl sink {self._sink})", self._log_path)
 
@@ -127,12 +331,16 @@ class _PactlStrategy(_MuteStrategy):
         if not self._active:
             return
         try:
+            self._join_pending()
             if self._previously_muted is False:
-                subprocess.run(["pactl", "set-sink-mute", self._sink, "0"], check=True)
+                self._cache.suppress_events(self._SELF_EVENT_WINDOW)
+                subprocess.run([self._bin, "set-sink-mute", self._sink, "0"], check=True)
                 write_log(f"Restored system audio (pactl sink {self._sink})", self._log_path)
             else:
                 write_log("Audio was muted before capture; left muted (pactl)", self._log_path)
+            self._remember_restored_state()
         except subprocess.CalledProcessError as exc:
+            self._cache.invalidate(self._cache_key())
             raise AudioMuteError(f"pactl restore failed: {exc}") from exc
         finally:
             self._active = False
@@ -140,14 +348,17 @@ class _PactlStrategy(_MuteStrategy):
 
     def _detect_sink(self) -> str:
         try:
-            output = subprocess.check_output(["pactl", "get-default-sink"], text=True)
+            output = subprocess.check_output([self._bin, "get-default-sink"], text=True)
         except subprocess.CalledProcessError as exc:
             raise AudioMuteError(f"pactl get-default-sink failed: {exc}") from exc
         return output.strip()
 
+    def _cache_key(self) -> str:
+        return self._sink
+
     def _read_muted(self) -> Optional[bool]:
         try:
-            output = subprocess.check_output(["pactl", "get-sink-mute", self._sink], text=True)
+            output = subprocess.check_output([self._bin, "get-sink-mute", self._sink], text=True)
         except subprocess.CalledProcessError as exc:
             raise AudioMuteError(f"pactl get-sink-mute failed: {exc}") from exc
         normalized = output.strip().lower()
@@ -171,6 +382,8 @@ class PushToTalkHotkey:
         enable_audio_mute: bool = True,
         exit_on_esc: bool = True,
         on_exit: Callable[[], None] | None = None,
+        listener_cpu: Optional[int] = None,
+        listener_rt_priority: int = 0,
     ) -> None:
         self._recorder = recorder
         self._silence_timeout = silence_timeout
@@ -178,22 +391,58 @@ class PushToTalkHotkey:
         self._log_path = log_path
         self._exit_on_esc = exit_on_esc
         self._on_exit = on_exit
-        self._mute_controller = AudioMuteController(log_path) if enable_audio_mute else None
+        self._listener_cpu = listener_cpu
+        self._listener_rt_priority = listener_rt_priority
+        self._mute_controller = (
+            AudioMuteController(log_path, on_disabled=self._disable_audio_mute)
+            if enable_audio_mute
+            else None
+        )
+        # Bind the mute hooks once so the keypress path skips the enabled checks.
+        self._mute_audio: Callable[[], None] = _noop
+        self._restore_audio: Callable[[], None] = _noop
+        if self._mute_controller and self._mute_controller.enabled:
+            self._mute_audio = self._mute_controller.mute
+            self._restore_audio = self._mute_controller.restore
 
         self._listener: keyboard.Listener | None = None
         self._active = False
-        self._lock = threading.RLock()
+        # Guards the _active compare-and-set; never taken recursively.
+        self._lock = threading.Lock()
+        # One long-lived thread finalizes captures; None is the shutdown sentinel.
+        self._finalize_q: "queue.SimpleQueue[bool | None]" = queue.SimpleQueue()
+        self._finalize_thread: threading.Thread | None = None
+        # Muting and Recorder.start() run on their own untuned worker: threads and
+        # processes inherit the creator's policy and affinity, so doing this work
+        # on a tuned listener would pin and realtime-promote the drain thread and
+        # the wpctl/pactl children too.
+        # Items are press generations; a failed start only clears _active when no
+        # newer press has taken over in the meantime.
+        self._press_q: "queue.SimpleQueue[int | None]" = queue.SimpleQueue()
+        self._press_thread: threading.Thread | None = None
+        self._press_generation = 0
+        # Presses queued or still starting; finalization waits for them to drain so
+        # it never stops a recorder that is still starting.
+        self._pending_presses = 0
+        self._presses_done = threading.Condition(self._lock)
 
     def start(self) -> None:
         """Begin listening for hotkey events."""
         if self._listener:
             return
+        if self._finalize_thread is None:
+            self._finalize_thread = threading.Thread(target=self._finalize_loop, daemon=True)
+            self._finalize_thread.start()
+        if self._press_thread is None:
+            self._press_thread = threading.Thread(target=self._press_loop, daemon=True)
+            self._press_thread.start()
         self._listener = keyboard.Listener(
             on_press=self._handle_press,
             on_release=self._handle_release,
             suppress=False,
         )
         self._listener.start()
+        self._tune_listener_thread()
         write_log("Hotkey listener started (Right Alt)", self._log_path)
 
     def stop(self) -> None:
@@ -202,33 +451,40 @@ class PushToTalkHotkey:
             if self._listener:
                 self._listener.stop()
                 self._listener = None
+            if self._finalize_thread is not None:
+                self._finalize_q.put(None)
+                self._finalize_thread = None
+            if self._press_thread is not None:
+                self._press_q.put(None)
+                self._press_thread = None
         self._restore_audio()
+        if self._mute_controller:
+            self._mute_controller.close()
         write_log("Hotkey listener stopped", self._log_path)
 
     # Internal event handling ---------------------------------------------------------
 
+    def _tune_listener_thread(self) -> None:
+        # Keep keypress delivery prompt while Whisper saturates the CPU.
+        if self._listener_cpu is None and self._listener_rt_priority <= 0:
+            return
+        outcome = tune_thread_scheduling(
+            getattr(self._listener, "native_id", None),
+            cpus=None if self._listener_cpu is None else {self._listener_cpu},
+            realtime_priority=self._listener_rt_priority,
+        )
+        write_log(f"Hotkey listener scheduling: {outcome}", self._log_path)
+
     def _handle_press(self, key: keyboard.Key | keyboard.KeyCode) -> None:
         if key == keyboard.Key.alt_r:
             with self._lock:
                 if self._active:
                     return
                 self._active = True
-            self._mute_audio()
-            try:
-                path = self._recorder.start()
-            except RecorderStartError as exc:
-                with self._lock:
-                    self._active = False
-                self._restore_audio()
-                write_log(f"Recorder could not start: {exc}", self._log_path)
-                return
-            except Exception as exc:  # pragma: no cover - defensive guard
-                with self._lock:
-                    self._active = False
-                self._restore_audio()
-                write_log(f"Unexpected recorder failure: {exc}", self._log_path)
-                return
-            write_log(f"Right Alt pressed; recording -> {path}", self._log_path)
+                self._press_generation += 1
+                generation = self._press_generation
+                self._pending_presses += 1
+            self._press_q.put(generation)
         elif self._exit_on_esc and key == keyboard.Key.esc:
             write_log("ESC pressed; terminating listener", self._log_path)
             self.stop()
@@ -242,19 +498,58 @@ class PushToTalkHotkey:
             if not self._active:
                 return
             self._active = False
-        threading.Thread(target=self._finalize_capture, daemon=True).start()
+        self._finalize_q.put(True)
+
+    def _press_loop(self) -> None:
+        while True:
+            generation = self._press_q.get()
+            if generation is None:
+                return
+            try:
+                self._begin_capture(generation)
+            finally:
+                with self._presses_done:
+                    self._pending_presses -= 1
+                    if not self._pending_presses:
+                        self._presses_done.notify_all()
+
+    def _begin_capture(self, generation: int) -> None:
+        self._mute_audio()
+        try:
+            path = self._recorder.start()
+        except RecorderStartError as exc:
+            self._abort_press(generation)
+            write_log(f"Recorder could not start: {exc}", self._log_path)
+            return
+        except Exception as exc:  # pragma: no cover - defensive guard
+            self._abort_press(generation)
+            write_log(f"Unexpected recorder failure: {exc}", self._log_path)
+            return
+        write_log(f"Right Alt pressed; recording -> {path}", self._log_path)
+
+    def _abort_press(self, generation: int) -> None:
+        with self._lock:
+            # A later press owns _active now; resetting it would swallow its release.
+            if generation == self._press_generation:
+                self._active = False
+        self._restore_audio()
+
+    def _finalize_loop(self) -> None:
+        while self._finalize_q.get() is not None:
+            try:
+                self._finalize_capture()
+            except Exception as exc:  # pragma: no cover - keep the worker alive
+                write_log(f"Capture finalization failed: {exc}", self._log_path)
 
     def _finalize_capture(self) -> None:
+        with self._presses_done:
+            self._presses_done.wait_for(lambda: not self._pending_presses)
         result_path = self._recorder.stop(self._silence_timeout)
         stats = self._recorder.last_capture_stats()
         self._restore_audio()
         write_log("Recording finalized", self._log_path)
         self._on_capture_finished(result_path, stats)
 
-    def _mute_audio(self) -> None:
-        if self._mute_controller:
-            self._mute_controller.mute()
-
-    def _restore_audio(self) -> None:
-        if self._mute_controller:
-            self._mute_controller.restore()
+    def _disable_audio_mute(self) -> None:
+        self._mute_audio = _noop
+        self._restore_audio = _noop
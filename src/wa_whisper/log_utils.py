@@ -2,11 +2,19 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+import atexit
+import contextlib
+import os
+import queue
+import threading
+import time
 from pathlib import Path
+from typing import Dict, List, Tuple, Union
 
 DEFAULT_LOG_PATH = Path.home() / ".cache" / "wa_whisper" / "push_to_talk.log"
 
+_LogItem = Union[Tuple[Path, float, str], threading.Event]
+
 
 def ensure_log_path(log_path: Path) -> Path:
     """Ensure the log directory exists and return the usable path."""
@@ -16,10 +24,150 @@ def ensure_log_path(log_path: Path) -> Path:
     return log_path
 
 
+# Paths whose directory has already been created; directory existence is monotonic
+# for the life of the process, so it only needs checking once per path.
+_ENSURED: set[Path] = set()
+
+_LAST_SEC = -1
+_LAST_STR = ""
+
+
+def _format_timestamp(epoch: float) -> str:
+    """Format `epoch` as ISO-8601 UTC, reusing the string within the same second.
+
+    Only the log writer thread calls this, so the cache needs no locking.
+    """
+    global _LAST_SEC, _LAST_STR
+    sec = int(epoch)
+    if sec != _LAST_SEC:
+        _LAST_STR = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(sec))
+        _LAST_SEC = sec
+    return _LAST_STR
+
+
+class _LogFile:
+    """Append-only file descriptor that stays open for the process lifetime."""
+
+    _FLAGS = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_CLOEXEC", 0)
+
+    def __init__(self, log_path: Path) -> None:
+        # Resolve the fspath once so reopening skips Path.__fspath__.
+        self._path = os.fspath(log_path)
+        self._fd: int | None = None
+
+    def write(self, data: bytes) -> None:
+        if self._fd is None:
+            self._fd = os.open(self._path, self._FLAGS, 0o644)
+        view = memoryview(data)
+        while view:
+            written = os.write(self._fd, view)
+            view = view[written:]
+
+    def close(self) -> None:
+        fd, self._fd = self._fd, None
+        if fd is not None:
+            os.close(fd)
+
+
+class _LogWriter:
+    """Drain queued log lines on a daemon thread and append them in batches."""
+
+    _BATCH_LIMIT = 256
+
+    def __init__(self) -> None:
+        self._queue: "queue.SimpleQueue[_LogItem]" = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._files: Dict[Path, _LogFile] = {}
+
+    def submit(self, log_path: Path, message: str) -> None:
+        self._ensure_thread()
+        self._queue.put((log_path, time.time(), message))
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until every line queued so far has been written."""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout: float | None = None) -> None:
+        """Flush pending lines and close the open log descriptors."""
+        self.flush(timeout)
+        for log_file in list(self._files.values()):
+            with contextlib.suppress(OSError):
+                log_file.close()
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                thread = threading.Thread(target=self._run, name="wa-whisper-log", daemon=True)
+                thread.start()
+                self._thread = thread
+
+    def _run(self) -> None:
+        while True:
+            batch: List[_LogItem] = [self._queue.get()]
+            while len(batch) < self._BATCH_LIMIT:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write_batch(batch)
+
+    def _write_batch(self, batch: List[_LogItem]) -> None:
+        pending: Dict[Path, List[str]] = {}
+        waiters: List[threading.Event] = []
+        for item in batch:
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+                continue
+            log_path, epoch, message = item
+            stamp = _format_timestamp(epoch)
+            lines = pending.setdefault(log_path, [])
+            if "\n" in message:
+                lines.extend(f"{stamp} {part}\n" for part in message.split("\n"))
+            else:
+                lines.append(f"{stamp} {message}\n")
+        for log_path, lines in pending.items():
+            try:
+                if log_path not in _ENSURED:
+                    ensure_log_path(log_path)
+                    _ENSURED.add(log_path)
+                log_file = self._files.get(log_path)
+                if log_file is None:
+                    log_file = self._files[log_path] = _LogFile(log_path)
+                log_file.write("".join(lines).encode("utf-8", "ignore"))
+            except OSError:
+                # Logging must never take down the caller threads; reopen and
+                # re-check the directory next time in case it was removed.
+                _ENSURED.discard(log_path)
+                stale = self._files.pop(log_path, None)
+                if stale is not None:
+                    with contextlib.suppress(OSError):
+                        stale.close()
+                continue
+        for waiter in waiters:
+            waiter.set()
+
+
+_WRITER = _LogWriter()
+
+
 def write_log(message: str, log_path: Path = DEFAULT_LOG_PATH) -> None:
-    """Append `message` to the log with a UTC timestamp."""
-    timestamp = datetime.utcnow().isoformat(timespec="seconds") + "Z"
-    path = ensure_log_path(log_path)
-    with path.open("a", encoding="utf-8", errors="ignore") as fp:
-        fp.write(f"{timestamp} {message}\n")
+    """Queue `message` for the log with a UTC timestamp.
+
+    Multi-line messages are written together, each line carrying the timestamp.
+    """
+    _WRITER.submit(log_path, message)
+
+
+def flush_log(timeout: float | None = None) -> bool:
+    """Wait for queued log lines to reach disk; return False on timeout."""
+    return _WRITER.flush(timeout)
+
 
+atexit.register(_WRITER.close, 2.0)
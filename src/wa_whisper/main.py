@@ -3,21 +3,41 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import queue
-import shutil
 import signal
 import subprocess
 import sys
 import threading
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
+
+import numpy as np
+import sounddevice as sd
+import soundfile as sf
 
 from .hotkeys import PushToTalkHotkey
 from .log_utils import DEFAULT_LOG_PATH, ensure_log_path, write_log
+from .proc_utils import which
 from .recorder import Recorder, RecorderStats
 from .text_postprocess import postprocess_text
 from .voice_isolation import VoiceIsolationPipeline
-from .whisper_backend import DEFAULT_MODEL_CACHE, WhisperBackend, WhisperConfig
+from .whisper_backend import (
+    BACKENDS,
+    DEFAULT_MODEL_CACHE,
+    WHISPER_SAMPLE_RATE,
+    WhisperBackend,
+    WhisperConfig,
+)
+
+
+def _latency_arg(value: str) -> Union[float, str]:
+    if value in ("low", "high"):
+        return value
+    try:
+        return float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected 'low', 'high' or seconds") from None
 
 
 def build_arg_parser() -> argparse.ArgumentParser:
@@ -27,8 +47,21 @@ def build_arg_parser() -> argparse.ArgumentParser:
     parser.add_argument("--preamp", type=float, default=1.0, help="Signal gain applied before encoding.")
     parser.add_argument("--silence-timeout", type=float, default=0.5, help="Seconds of silence before stop.")
     parser.add_argument("--device-index", type=int, default=None, help="SoundDevice input index.")
+    parser.add_argument(
+        "--input-latency",
+        type=_latency_arg,
+        default="low",
+        help="Input stream latency: 'low', 'high' or seconds (e.g. 0.04).",
+    )
     parser.add_argument("--log-path", type=Path, default=DEFAULT_LOG_PATH, help="Log file path.")
     parser.add_argument("--model", default="large-v3", help="Whisper model name.")
+    parser.add_argument(
+        "--backend",
+        choices=sorted(BACKENDS),
+        default="whisper",
+        help="Inference backend (ctranslate2 uses faster-whisper INT8/FP16 kernels).",
+    )
+    parser.add_argument("--compute-type", default=None, help="CTranslate2 compute type (default: int8 / int8_float16).")
     parser.add_argument("--beam-size", type=int, default=5, help="Beam search width.")
     parser.add_argument("--best-of", type=int, default=5, help="Number of candidate samples.")
     parser.add_argument("--temperature", type=float, default=0.0, help="Sampling temperature.")
@@ -44,10 +77,27 @@ def build_arg_parser() -> argparse.ArgumentParser:
     parser.add_argument("--no-voice-isolation", action="store_true", help="Disable placeholder voice isolation.")
     parser.add_argument("--xdotool-path", type=Path, default=None, help="Override xdotool binary path.")
     parser.add_argument("--disable-complete-beep", action="store_true", help="Disable post-paste completion beep.")
+    parser.add_argument("--hotkey-cpu", type=int, default=None, help="Pin the hotkey listener to this CPU.")
+    parser.add_argument(
+        "--hotkey-rt-priority",
+        type=int,
+        default=0,
+        help="SCHED_FIFO priority for the hotkey listener (0 disables; needs rtkit/CAP_SYS_NICE).",
+    )
+    parser.add_argument("--drain-cpu", type=int, default=None, help="Pin the audio drain thread to this CPU.")
+    parser.add_argument(
+        "--drain-rt-priority",
+        type=int,
+        default=0,
+        help="SCHED_FIFO priority for the audio drain thread (0 disables; needs rtkit/CAP_SYS_NICE).",
+    )
     return parser
 
 
-TaskItem = Optional[Tuple[Path, Optional[RecorderStats]]]
+TaskItem = Optional[Tuple[Path, Optional[RecorderStats], Optional[np.ndarray]]]
+EnhancedItem = Optional[Tuple[Path, Path, Optional[np.ndarray]]]
+# Captures waiting for transcription; beyond this new captures are dropped.
+MAX_PENDING_CAPTURES = 4
 DEFAULT_BEEP_COMMAND = (
     Path("/usr/bin/paplay"),
     Path("/usr/share/sounds/freedesktop/stereo/bell.oga"),
@@ -56,8 +106,9 @@ DEFAULT_BEEP_COMMAND = (
 
 def ensure_xdotool(path_override: Optional[Path]) -> Path:
     if path_override:
-        return path_override
-    resolved = shutil.which("xdotool")
+        # Absolute paths let subprocess skip the PATH search and use vfork/posix_spawn.
+        return path_override.expanduser().resolve()
+    resolved = which("xdotool")
     if not resolved:
         raise RuntimeError("xdotool not found; install it to enable text injection.")
     return Path(resolved)
@@ -67,8 +118,28 @@ def main(argv: Optional[list[str]] = None) -> None:
     parser = build_arg_parser()
     args = parser.parse_args(argv)
 
+    # Python runs signal handlers on the main thread only, so the handler just
+    # records the signal and wakes main(); shutdown itself happens outside the
+    # handler. No signal mask is changed, so helper processes (pactl, wpctl,
+    # xdotool, paplay) still honour SIGTERM/SIGINT.
+    shutdown_requested = threading.Event()
+    received_signals: list[int] = []
+
+    def on_shutdown_signal(signum: int, _frame: object) -> None:
+        received_signals.append(signum)
+        shutdown_requested.set()
+
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, on_shutdown_signal)
+
     log_path = ensure_log_path(args.log_path)
     write_log("wa_whisper starting", log_path)
+    write_log(
+        "Subprocess spawn fast paths: "
+        f"vfork={getattr(subprocess, '_USE_VFORK', False)} "
+        f"posix_spawn={getattr(subprocess, '_USE_POSIX_SPAWN', False)}",
+        log_path,
+    )
 
     config = WhisperConfig(
         model_name=args.model,
@@ -78,51 +149,88 @@ def main(argv: Optional[list[str]] = None) -> None:
         initial_prompt=args.initial_prompt,
         cache_dir=args.model_cache or DEFAULT_MODEL_CACHE,
         device=args.device,
+        compute_type=args.compute_type,
     )
 
-    backend = WhisperBackend(config, log_path)
+    backend = BACKENDS[args.backend](config, log_path)
+    # Load (and on CUDA warm up) the model before accepting captures; a missing
+    # backend package or model fails startup here instead of every capture.
+    try:
+        backend.load()
+    except Exception as exc:
+        write_log(f"Whisper model load failed; exiting: {exc}", log_path)
+        raise
     recorder = Recorder(
         sample_rate=args.sample_rate,
         device_index=args.device_index,
         log_path=log_path,
         rms_threshold=args.rms_threshold,
         preamp=args.preamp,
+        latency=args.input_latency,
+        drain_cpu=args.drain_cpu,
+        drain_rt_priority=args.drain_rt_priority,
     )
     voice_isolation = None if args.no_voice_isolation else VoiceIsolationPipeline(log_path)
-    xdotool_bin = ensure_xdotool(args.xdotool_path)
+    injector = TextInjector(
+        ensure_xdotool(args.xdotool_path),
+        log_path,
+        enable_beep=not args.disable_complete_beep,
+    )
 
-    task_queue: "queue.Queue[TaskItem]" = queue.Queue()
+    # Two-stage pipeline: enhancement of capture N+1 overlaps transcription of N.
+    task_queue: "queue.Queue[TaskItem]" = queue.Queue(maxsize=MAX_PENDING_CAPTURES)
+    transcribe_queue: "queue.Queue[EnhancedItem]" = queue.Queue(maxsize=MAX_PENDING_CAPTURES)
     stop_event = threading.Event()
 
-    def worker_loop() -> None:
+    def enhance_loop() -> None:
         while True:
-            try:
-                item = task_queue.get(timeout=0.1)
-            except queue.Empty:
-                if stop_event.is_set():
-                    continue
-                continue
+            # request_shutdown enqueues the None sentinel, so a blocking get is enough.
+            item = task_queue.get()
             if item is None:
+                transcribe_queue.put(None)
                 task_queue.task_done()
                 break
-            audio_path, stats = item
-            process_capture(
+            audio_path, stats, samples = item
+            enhanced_path = enhance_capture(
                 audio_path=audio_path,
                 stats=stats,
-                backend=backend,
                 voice_isolation=voice_isolation,
                 log_path=log_path,
+            )
+            if enhanced_path is not None:
+                if enhanced_path != audio_path:
+                    # The enhanced file supersedes the raw in-memory samples.
+                    samples = None
+                transcribe_queue.put((audio_path, enhanced_path, samples))
+            task_queue.task_done()
+
+    def transcribe_loop() -> None:
+        while True:
+            item = transcribe_queue.get()
+            if item is None:
+                transcribe_queue.task_done()
+                break
+            audio_path, enhanced_path, samples = item
+            process_capture(
+                audio_path=audio_path,
+                enhanced_path=enhanced_path,
+                samples=samples,
+                backend=backend,
+                log_path=log_path,
                 append_space=True,
                 normalize_numbers=not args.disable_number_normalization,
                 normalize_acronyms=not args.disable_acronym_normalization,
                 ensure_punct=not args.disable_punctuation,
-                xdotool_bin=xdotool_bin,
-                enable_beep=not args.disable_complete_beep,
+                injector=injector,
             )
-            task_queue.task_done()
+            transcribe_queue.task_done()
 
-    worker = threading.Thread(target=worker_loop, daemon=True)
-    worker.start()
+    workers = [
+        threading.Thread(target=enhance_loop, daemon=True),
+        threading.Thread(target=transcribe_loop, daemon=True),
+    ]
+    for worker in workers:
+        worker.start()
 
     def handle_capture(path: Optional[Path], stats: Optional[RecorderStats]) -> None:
         if stop_event.is_set():
@@ -132,7 +240,13 @@ def main(argv: Optional[list[str]] = None) -> None:
         if path is None:
             write_log("Capture finished with no audio file", log_path)
             return
-        task_queue.put((path, stats))
+        # Whisper takes 16 kHz samples directly; other rates go through the WAV file.
+        samples = recorder.last_capture_audio() if args.sample_rate == WHISPER_SAMPLE_RATE else None
+        try:
+            task_queue.put_nowait((path, stats, samples))
+        except queue.Full:
+            write_log(f"Transcription backlog full; dropping capture {path}", log_path)
+            path.unlink(missing_ok=True)
 
     hotkey = PushToTalkHotkey(
         recorder,
@@ -142,62 +256,103 @@ def main(argv: Optional[list[str]] = None) -> None:
         enable_audio_mute=not args.no_audio_mute,
         exit_on_esc=args.exit_on_esc,
         on_exit=lambda: request_shutdown(signal.SIGTERM),
+        listener_cpu=args.hotkey_cpu,
+        listener_rt_priority=args.hotkey_rt_priority,
     )
 
+    def deliver_stop_sentinel() -> None:
+        # The queue is bounded, so a blocking put could stall the caller (the
+        # pynput thread on ESC) behind the backlog. Drop unstarted captures
+        # instead and enqueue the sentinel without waiting.
+        while True:
+            try:
+                task_queue.put_nowait(None)
+                return
+            except queue.Full:
+                pass
+            while True:
+                try:
+                    item = task_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    write_log(f"Shutting down; dropping queued capture {item[0]}", log_path)
+                    item[0].unlink(missing_ok=True)
+                task_queue.task_done()
+
     def request_shutdown(signum: int) -> None:
         if stop_event.is_set():
             return
         write_log(f"Received shutdown signal {signum}", log_path)
         stop_event.set()
         hotkey.stop()
-        task_queue.put(None)
-
-    def shutdown(signum: int, _frame) -> None:
-        request_shutdown(signum)
-
-    signal.signal(signal.SIGINT, shutdown)
-    signal.signal(signal.SIGTERM, shutdown)
+        deliver_stop_sentinel()
+        # Wake the main thread when shutdown starts elsewhere (e.g. ESC pressed).
+        shutdown_requested.set()
 
     try:
         hotkey.start()
         write_log("Ready for push-to-talk (Right Alt)", log_path)
-        stop_event.wait()
+        shutdown_requested.wait()
+        request_shutdown(received_signals[0] if received_signals else signal.SIGTERM)
     finally:
         request_shutdown(signal.SIGTERM)
         task_queue.join()
-        worker.join(timeout=2.0)
+        transcribe_queue.join()
+        for worker in workers:
+            worker.join(timeout=2.0)
+        recorder.close()
         write_log("wa_whisper stopped", log_path)
 
 
-def process_capture(
+def enhance_capture(
     *,
     audio_path: Path,
     stats: Optional[RecorderStats],
-    backend: WhisperBackend,
     voice_isolation: Optional[VoiceIsolationPipeline],
     log_path: Path,
-    append_space: bool,
-    normalize_numbers: bool,
-    normalize_acronyms: bool,
-    ensure_punct: bool,
-    xdotool_bin: Path,
-    enable_beep: bool,
-) -> None:
-    write_log(f"Processing capture {audio_path}", log_path)
+) -> Optional[Path]:
+    """Run the enhancement stage; return the path to transcribe or None on failure."""
+    lines = [f"Processing capture {audio_path}"]
     if stats:
         ratio = f"{stats.speech_ratio:.2f}" if stats.speech_ratio is not None else "n/a"
         max_db = f"{stats.speech_max_db:.1f}dB" if stats.speech_max_db is not None else "n/a"
-        write_log(
+        lines.append(
             "Capture stats "
             f"total={stats.total_ms:.1f}ms speech={stats.speech_ms:.1f}ms "
-            f"silence={stats.silence_ms:.1f}ms ratio={ratio} max_db={max_db}",
-            log_path,
+            f"silence={stats.silence_ms:.1f}ms ratio={ratio} max_db={max_db}"
         )
-    enhanced_path = audio_path
+    write_log("\n".join(lines), log_path)
+    if not voice_isolation:
+        return audio_path
+    try:
+        return voice_isolation.enhance(audio_path)
+    except Exception as exc:  # pragma: no cover - defensive log
+        write_log(f"Capture enhancement failed: {exc}", log_path)
+        audio_path.unlink(missing_ok=True)
+        return None
+
+
+def process_capture(
+    *,
+    audio_path: Path,
+    enhanced_path: Path,
+    samples: Optional[np.ndarray],
+    backend: WhisperBackend,
+    log_path: Path,
+    append_space: bool,
+    normalize_numbers: bool,
+    normalize_acronyms: bool,
+    ensure_punct: bool,
+    injector: "TextInjector",
+) -> None:
+    """Run the transcription stage and remove the capture files afterwards.
+
+    When `samples` holds the captured audio it is transcribed directly and the
+    WAV file is only cleaned up.
+    """
     try:
-        if voice_isolation:
-            enhanced_path = voice_isolation.enhance(audio_path)
-        result = backend.transcribe(enhanced_path)
+        result = backend.transcribe(samples if samples is not None else enhanced_path)
         text = postprocess_text(
             result.text,
             normalize_numbers_enabled=normalize_numbers,
@@ -208,7 +363,7 @@ def process_capture(
         if not text:
             write_log("No text produced from transcription", log_path)
             return
-        inject_text(text, xdotool_bin, log_path, enable_beep=enable_beep)
+        injector.inject(text)
         write_log(f"Injected text: {text}", log_path)
     except Exception as exc:  # pragma: no cover - defensive log
         write_log(f"Capture processing failed: {exc}", log_path)
@@ -218,23 +373,65 @@ def process_capture(
         audio_path.unlink(missing_ok=True)
 
 
-def inject_text(text: str, xdotool_bin: Path, log_path: Path, *, enable_beep: bool) -> None:
-    try:
-        subprocess.run(
-            [str(xdotool_bin), "type", "--clearmodifiers", text],
-            check=True,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-        )
-    except subprocess.CalledProcessError as exc:
-        write_log(f"xdotool failed: {exc}", log_path)
-    else:
+class TextInjector:
+    """Type transcriptions into the focused window via xdotool.
+
+    Created once at startup so the command prefix is resolved a single time.
+    xdotool's script mode (`xdotool -`) only executes after stdin reaches EOF,
+    so one long-lived process cannot be fed utterances incrementally; each
+    injection still runs a short-lived `xdotool type`.
+    """
+
+    def __init__(self, xdotool_bin: Path, log_path: Path, *, enable_beep: bool) -> None:
+        # xdotool sleeps 12 ms between keystrokes by default; `--` keeps text that
+        # starts with "-" from being parsed as an option.
+        self._command = (str(xdotool_bin), "type", "--clearmodifiers", "--delay", "0", "--")
+        self._log_path = log_path
+        self._enable_beep = enable_beep
+        self._lock = threading.Lock()
         if enable_beep:
-            play_completion_beep(log_path)
+            # Decode the bell up front so the first beep does not pay for it.
+            _load_beep_sound(DEFAULT_BEEP_COMMAND[1])
+
+    def inject(self, text: str) -> None:
+        """Type `text` and play the completion beep on success."""
+        with self._lock:
+            try:
+                subprocess.run(
+                    [*self._command, text],
+                    check=True,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                )
+            except subprocess.CalledProcessError as exc:
+                write_log(f"xdotool failed: {exc}", self._log_path)
+                return
+        if self._enable_beep:
+            play_completion_beep(self._log_path)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_beep_sound(sound: Path) -> Optional[Tuple[np.ndarray, int]]:
+    """Decode `sound` once; None when libsndfile cannot read it."""
+    if not sound.exists():
+        return None
+    try:
+        data, samplerate = sf.read(str(sound), dtype="float32")
+    except Exception:  # pragma: no cover - depends on libsndfile codec support
+        return None
+    return data, int(samplerate)
 
 
 def play_completion_beep(log_path: Path) -> None:
     player, sound = DEFAULT_BEEP_COMMAND
+    decoded = _load_beep_sound(sound)
+    if decoded is not None:
+        data, samplerate = decoded
+        try:
+            sd.play(data, samplerate, blocking=False)
+            return
+        except Exception as exc:  # pragma: no cover - output device specific
+            write_log(f"Completion beep via sounddevice failed: {exc}; using paplay", log_path)
     if not player.exists() or not sound.exists():
         write_log("Completion beep skipped: paplay or bell sound missing", log_path)
         return
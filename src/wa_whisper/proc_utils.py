@@ -0,0 +1,53 @@
+"""Subprocess helpers shared across wa_whisper modules."""
+
+from __future__ import annotations
+
+import functools
+import os
+import shutil
+from typing import Iterable, Optional
+
+
+@functools.lru_cache(maxsize=None)
+def which(name: str) -> Optional[str]:
+    """Return the absolute path of `name` on PATH, scanning PATH once per name."""
+    return shutil.which(name)
+
+
+def tune_thread_scheduling(
+    native_id: int | None,
+    *,
+    cpus: Optional[Iterable[int]] = None,
+    realtime_priority: int = 0,
+) -> str:
+    """Best-effort CPU pinning and SCHED_FIFO for a thread (Linux only).
+
+    Returns a short summary suitable for the log; failures are reported rather
+    than raised because unprivileged desktops usually refuse realtime policies.
+    """
+    if native_id is None:
+        return "thread not running"
+    outcomes: list[str] = []
+    cpu_set = set(cpus) if cpus is not None else set()
+    if cpu_set:
+        if hasattr(os, "sched_setaffinity"):
+            try:
+                os.sched_setaffinity(native_id, cpu_set)
+                outcomes.append(f"affinity={sorted(cpu_set)}")
+            except OSError as exc:
+                outcomes.append(f"affinity failed ({exc})")
+        else:
+            outcomes.append("affinity unsupported")
+    if realtime_priority > 0:
+        if hasattr(os, "sched_setscheduler"):
+            try:
+                # Reset-on-fork keeps threads and processes created by this one
+                # from inheriting the realtime policy.
+                policy = os.SCHED_FIFO | getattr(os, "SCHED_RESET_ON_FORK", 0)
+                os.sched_setscheduler(native_id, policy, os.sched_param(realtime_priority))
+                outcomes.append(f"SCHED_FIFO priority={realtime_priority}")
+            except OSError as exc:
+                outcomes.append(f"SCHED_FIFO failed ({exc})")
+        else:
+            outcomes.append("SCHED_FIFO unsupported")
+    return ", ".join(outcomes) or "unchanged"
@@ -2,22 +2,98 @@
 
 from __future__ import annotations
 
+import atexit
+import collections
 import contextlib
 import math
 import os
-import queue
 import tempfile
 import threading
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
 import numpy as np
 import sounddevice as sd
 import soundfile as sf
 
 from .log_utils import write_log
+from .proc_utils import tune_thread_scheduling
+
+try:  # Optional SIMD kernel that fuses square + mean + sqrt in one pass.
+    import numpy_rms
+except ImportError:  # pragma: no cover - optional dependency
+    numpy_rms = None
+
+try:  # Optional JIT for the per-block reduction.
+    from numba import njit
+except ImportError:  # pragma: no cover - optional dependency
+    njit = None
+
+
+if njit is not None:
+
+    @njit(cache=True, fastmath=True)
+    def _sum_of_squares(samples):  # pragma: no cover - compiled by numba
+        total = 0.0
+        for i in range(samples.size):
+            value = float(samples[i])
+            total += value * value
+        return total
+
+    @njit(cache=True, fastmath=True)
+    def _preamp_clip_sum_sq(samples, gain, out):  # pragma: no cover - compiled by numba
+        # One pass: scale in float32 (matching NumPy), clip to [-1, 1], store
+        # and accumulate the square while the sample is still in a register.
+        total = 0.0
+        for i in range(samples.size):
+            value = samples[i] * gain
+            if value > 1.0:
+                value = 1.0
+            elif value < -1.0:
+                value = -1.0
+            out[i] = value
+            square = float(out[i])
+            total += square * square
+        return total
+
+else:
+    _sum_of_squares = None
+    _preamp_clip_sum_sq = None
+
+
+def _block_rms(block: np.ndarray) -> float:
+    """Return the RMS of `block` using the fastest available kernel.
+
+    Preference order: numpy-rms, a numba-compiled single-pass loop, then a
+    BLAS dot product of the block with itself (no temporary for the squares).
+    """
+    if not block.size:
+        return 0.0
+    if numpy_rms is not None and block.dtype == np.float32:
+        flat = np.ascontiguousarray(block.reshape(-1))
+        return float(numpy_rms.rms(flat, window_size=flat.size)[0])
+    if _sum_of_squares is not None:
+        return math.sqrt(_sum_of_squares(block.reshape(-1)) / block.size)
+    flat = block.reshape(-1)
+    return math.sqrt(float(np.dot(flat, flat)) / flat.size)
+
+
+# First back-off step after a failed stream start; doubles up to start_retry_delay.
+_START_RETRY_BASE_DELAY = 0.005
+
+
+# PortAudio errors that mean the device handle itself is bad: unanticipated host
+# error, invalid device, device unavailable. Anything else (e.g. a start
+# timeout) is retried on the same stream.
+_REOPEN_ERROR_CODES = frozenset({-9999, -9996, -9985})
+
+
+def _needs_reopen(exc: Exception) -> bool:
+    if not isinstance(exc, sd.PortAudioError):
+        return True
+    return len(exc.args) < 2 or exc.args[1] in _REOPEN_ERROR_CODES
 
 
 class RecorderStartError(Exception):
@@ -64,6 +140,211 @@ class RecorderStats:
         return 20 * math.log10(self.avg_silence_rms)
 
 
+_PCM16_SCALE = 32768.0
+
+
+def _to_pcm16(block: np.ndarray) -> np.ndarray:
+    """Convert float samples to saturated int16 exactly as libsndfile would.
+
+    libsndfile scales by 0x8000, floors and saturates; doing it here hands the
+    writer ready-made PCM_16 frames, half the bytes of float32.
+    """
+    scaled = np.multiply(block, _PCM16_SCALE, dtype=np.float32)
+    np.floor(scaled, out=scaled)
+    # fmax/fmin rather than clip: they map NaN to -32768 as libsndfile does,
+    # instead of leaving it to an undefined float-to-int cast.
+    np.fmax(scaled, -32768.0, out=scaled)
+    np.fmin(scaled, 32767.0, out=scaled)
+    return scaled.astype(np.int16)
+
+
+class _BlockPool:
+    """Recycle capture buffers so the audio callback avoids per-block allocations."""
+
+    def __init__(self, capacity: int = 64) -> None:
+        # deque append/pop are atomic, so neither side takes a lock; the length
+        # check may overshoot the capacity by a buffer or two under a race.
+        self._free: collections.deque[np.ndarray] = collections.deque()
+        self._capacity = capacity
+
+    def acquire(self, data: np.ndarray) -> np.ndarray:
+        """Return a pooled copy of `data`, allocating only when no buffer fits."""
+        try:
+            buf = self._free.pop()
+        except IndexError:
+            return data.copy()
+        if buf.shape != data.shape or buf.dtype != data.dtype:
+            return data.copy()
+        np.copyto(buf, data)
+        return buf
+
+    def release(self, buf: np.ndarray) -> None:
+        if len(self._free) < self._capacity:
+            self._free.append(buf)
+
+
+# Initial capture buffer size; it doubles if a capture runs longer.
+_CAPTURE_INITIAL_SECONDS = 30
+
+
+class _CaptureBuffer:
+    """Growable preallocated float32 buffer holding one capture's samples."""
+
+    def __init__(self, capacity: int) -> None:
+        # Allocated on first append so idle or failed starts cost nothing.
+        self._capacity = capacity
+        self._data: np.ndarray | None = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, block: np.ndarray) -> None:
+        flat = block.reshape(-1)
+        end = self._size + flat.size
+        if self._data is None:
+            self._data = np.empty(max(end, self._capacity), dtype=np.float32)
+        elif end > self._data.size:
+            grown = np.empty(max(end, 2 * self._data.size), dtype=np.float32)
+            grown[: self._size] = self._data[: self._size]
+            self._data = grown
+        self._data[self._size : end] = flat
+        self._size = end
+
+    def samples(self, start: int = 0) -> np.ndarray:
+        """Return a view of the samples from `start` to the current end."""
+        assert self._data is not None
+        return self._data[start : self._size]
+
+
+def _process_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # EPERM: the PID exists but belongs to someone else.
+        return True
+    return True
+
+
+class _WavFilePool:
+    """Open WAV writers ahead of time so `Recorder.start()` skips file setup.
+
+    A daemon thread keeps `size` writers ready; which files are still unclaimed
+    is tracked in memory, so claiming one needs no rename. When the pool is
+    empty the caller opens a file synchronously, exactly as before.
+    """
+
+    def __init__(self, sample_rate: int, log_path: Path, size: int = 2) -> None:
+        self._sample_rate = sample_rate
+        self._log_path = log_path
+        self._size = max(0, size)
+        self._entries: collections.deque[tuple[Path, sf.SoundFile]] = collections.deque()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread: threading.Thread | None = None
+        if self._size:
+            self._thread = threading.Thread(target=self._fill_loop, daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def acquire(self) -> tuple[Path, sf.SoundFile]:
+        """Return `(path, writer)` for a fresh WAV file."""
+        with self._lock:
+            entry = self._entries.popleft() if self._entries else None
+        self._wake.set()
+        if entry is None:
+            return self._open()
+        return entry
+
+    def close(self) -> None:
+        """Stop refilling and delete any unclaimed files."""
+        with self._lock:
+            self._closed = True
+            entries = list(self._entries)
+            self._entries.clear()
+        self._wake.set()
+        # Let an in-flight refill finish so it cleans up its own file.
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+        atexit.unregister(self.close)
+        for path, writer in entries:
+            with contextlib.suppress(Exception):
+                writer.close()
+            with contextlib.suppress(FileNotFoundError):
+                path.unlink()
+
+    @staticmethod
+    def _tmp_dir() -> Path:
+        return Path(tempfile.gettempdir()) / "wa_whisper"
+
+    def _open(self) -> tuple[Path, sf.SoundFile]:
+        tmp_dir = self._tmp_dir()
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        # The owner's PID in the name lets a later run tell crash leftovers apart
+        # from files another live instance still holds.
+        fd, filename = tempfile.mkstemp(prefix=f"{os.getpid()}-", suffix=".wav", dir=tmp_dir)
+        os.close(fd)
+        path = Path(filename)
+        try:
+            writer = sf.SoundFile(
+                str(path),
+                mode="w",
+                samplerate=self._sample_rate,
+                channels=1,
+                format="WAV",
+                subtype="PCM_16",
+            )
+        except Exception:
+            path.unlink(missing_ok=True)
+            raise
+        return path, writer
+
+    def _sweep_stale(self) -> None:
+        """Delete WAV files whose owning process is gone."""
+        try:
+            entries = list(os.scandir(self._tmp_dir()))
+        except OSError:
+            return
+        removed = 0
+        for entry in entries:
+            name = entry.name
+            if not name.endswith(".wav") or "-" not in name:
+                continue
+            owner = name.split("-", 1)[0]
+            if owner.isdigit() and not _process_alive(int(owner)):
+                with contextlib.suppress(OSError):
+                    os.unlink(entry.path)
+                    removed += 1
+        if removed:
+            write_log(f"Removed {removed} stale temporary WAV file(s)", self._log_path)
+
+    def _fill_loop(self) -> None:
+        self._sweep_stale()
+        while not self._closed:
+            self._wake.clear()
+            while not self._closed and len(self._entries) < self._size:
+                try:
+                    entry = self._open()
+                except Exception as exc:  # pragma: no cover - filesystem specific
+                    write_log(f"WAV pool refill failed: {exc}", self._log_path)
+                    break
+                with self._lock:
+                    if not self._closed:
+                        self._entries.append(entry)
+                        entry = None
+                if entry is not None:
+                    entry[1].close()
+                    entry[0].unlink(missing_ok=True)
+            # acquire() and close() set the event; nothing else needs a refill.
+            self._wake.wait()
+
+
 class Recorder:
     """Stream audio from the default microphone into a temporary WAV file."""
 
@@ -76,22 +357,44 @@ class Recorder:
         preamp: float = 1.0,
         start_retry_attempts: int = 3,
         start_retry_delay: float = 0.2,
+        start_retry_timeout: float = 2.0,
+        write_batch_frames: int = 16_384,
+        drain_cpu: Optional[int] = None,
+        drain_rt_priority: int = 0,
+        latency: Union[float, str] = "low",
     ) -> None:
         self.sample_rate = sample_rate
         self.device_index = device_index
         self.log_path = log_path
         self.rms_threshold = rms_threshold
         self.preamp = preamp
+        # PortAudio's own default is the "high" latency target; "low" uses the
+        # device's defaultLowInputLatency, seconds pick an explicit buffer size.
+        self.latency = latency
         self._start_retry_attempts = max(1, start_retry_attempts)
+        # Retries back off exponentially up to `start_retry_delay`, within an
+        # overall `start_retry_timeout` budget measured on the monotonic clock.
         self._start_retry_delay = max(0.0, start_retry_delay)
-
-        self._queue: queue.Queue[np.ndarray] = queue.Queue()
+        self._start_retry_timeout = max(0.0, start_retry_timeout)
+        self._write_batch_frames = max(1, write_batch_frames)
+        self._drain_cpu = drain_cpu
+        self._drain_rt_priority = max(0, drain_rt_priority)
+        self._drain_tuning: str | None = None
+
+        # Single-producer/single-consumer hand-off from the PortAudio callback to
+        # the drain thread: deque append/popleft are atomic, and the event only
+        # wakes the consumer, so no mutex is taken per block.
+        self._blocks: collections.deque[tuple[np.ndarray, int]] = collections.deque()
+        self._blocks_ready = threading.Event()
+        self._pool = _BlockPool()
+        self._wav_pool = _WavFilePool(sample_rate, log_path)
         self._stream: sd.InputStream | None = None
         self._writer: sf.SoundFile | None = None
         self._file: Path | None = None
         self._running = False
         self._worker: threading.Thread | None = None
-        self._last_audio_time = 0.0
+        # Written only by the drain thread; a single int store is atomic under the GIL.
+        self._last_audio_time_ns = 0
 
         # Capture statistics that feed silence gating.
         self._speech_duration_ms = 0.0
@@ -105,6 +408,11 @@ class Recorder:
         self._max_speech_streak_ms = 0.0
         self._current_speech_streak_ms = 0.0
 
+        # Float32 samples of the current capture, kept so callers can skip
+        # decoding the WAV again (see `last_capture_audio`).
+        self._captured = _CaptureBuffer(0)
+        self._last_audio: np.ndarray | None = None
+
         self._lock = threading.Lock()
         self._last_stats: RecorderStats | None = None
 
@@ -119,36 +427,55 @@ class Recorder:
         def audio_callback(indata, _frames, _time_info, status):
             if status:
                 write_log(f"Audio status: {status}", self.log_path)
-            self._queue.put(indata.copy())
+            # Stamp at callback entry so silence gating tracks capture time,
+            # not whenever the drain thread gets around to the block.
+            self._blocks.append((self._pool.acquire(indata), time.monotonic_ns()))
+            self._blocks_ready.set()
 
+        with self._lock:
+            # Reset state so we always begin from a clean queue.
+            self._blocks = collections.deque()
+            self._blocks_ready = threading.Event()
+            self._captured = _CaptureBuffer(self.sample_rate * _CAPTURE_INITIAL_SECONDS)
+            self._prepare_writer()
+
+        deadline = time.monotonic() + self._start_retry_timeout
+        delay = min(_START_RETRY_BASE_DELAY, self._start_retry_delay)
+        attempts = 0
+        # Opening the device is the expensive part, so a stream that merely
+        # failed to start is kept and started again on the next attempt.
+        stream: sd.InputStream | None = None
         for attempt in range(1, self._start_retry_attempts + 1):
-            with self._lock:
-                # Reset state so we always begin from a clean queue.
-                self._queue = queue.Queue()
-                self._prepare_writer()
-
-            stream: sd.InputStream | None = None
+            attempts = attempt
             try:
-                stream = sd.InputStream(
-                    samplerate=self.sample_rate,
-                    device=self.device_index,
-                    channels=1,
-                    dtype="float32",
-                    callback=audio_callback,
-                )
+                if stream is None:
+                    stream = sd.InputStream(
+                        samplerate=self.sample_rate,
+                        device=self.device_index,
+                        channels=1,
+                        dtype="float32",
+                        latency=self.latency,
+                        callback=audio_callback,
+                    )
                 stream.start()
             except Exception as exc:  # pragma: no cover - exercised in tests via stub
                 last_error = exc
-                if stream is not None:
+                self._handle_failed_start(exc=exc, attempt=attempt)
+                if stream is not None and _needs_reopen(exc):
                     with contextlib.suppress(Exception):
                         stream.close()
-                self._handle_failed_start(exc=exc, attempt=attempt)
+                    stream = None
+                if attempt == self._start_retry_attempts or time.monotonic() + delay > deadline:
+                    break
+                if delay > 0:
+                    time.sleep(delay)
+                delay = min(delay * 2, self._start_retry_delay)
                 continue
 
             with self._lock:
                 self._stream = stream
                 self._running = True
-                self._last_audio_time = time.time()
+                self._last_audio_time_ns = time.monotonic_ns()
                 self._reset_stats()
 
                 self._worker = threading.Thread(target=self._drain_queue, daemon=True)
@@ -159,7 +486,12 @@ class Recorder:
             # Success path shouldn't reach here, but guard anyway.
             break
 
-        attempts = self._start_retry_attempts
+        if stream is not None:
+            with contextlib.suppress(Exception):
+                stream.close()
+        with self._lock:
+            self._running = False
+            self._close_writer(remove_file=True)
         message = "Input stream failed to start"
         if last_error:
             message = f"{message}: {last_error}"
@@ -170,9 +502,9 @@ class Recorder:
         with self._lock:
             if not self._running:
                 return None
-            deadline = self._last_audio_time + timeout
+            deadline = self._last_audio_time_ns / 1e9 + timeout
 
-        while time.time() < deadline:
+        while time.monotonic() < deadline:
             time.sleep(0.05)
 
         with self._lock:
@@ -187,15 +519,26 @@ class Recorder:
 
         stats = self._finalize_stats()
         self._last_stats = stats
+        # Hand the buffer itself to the caller; the next start() allocates a new one.
+        captured, self._captured = self._captured, _CaptureBuffer(0)
+        self._last_audio = captured.samples() if len(captured) else None
         target = self._file
         write_log(f"Recorder stopped (stats={stats})", self.log_path)
         self._file = None
         return target
 
+    def close(self) -> None:
+        """Release pre-opened WAV files and stop the pool's refill thread."""
+        self._wav_pool.close()
+
     def last_capture_stats(self) -> RecorderStats | None:
         """Return statistics for the most recent capture."""
         return self._last_stats
 
+    def last_capture_audio(self) -> np.ndarray | None:
+        """Return the most recent capture as mono float32 samples at `sample_rate`."""
+        return self._last_audio
+
     # Internal helpers -----------------------------------------------------------------
 
     def _reset_stats(self) -> None:
@@ -211,47 +554,101 @@ class Recorder:
         self._current_speech_streak_ms = 0.0
         self._last_stats = None
 
+    def _tune_drain_thread(self) -> None:
+        # A preempted drain thread lets blocks pile up in the deque; pinning and
+        # SCHED_FIFO keep it close behind the PortAudio callback.
+        if self._drain_cpu is None and self._drain_rt_priority <= 0:
+            return
+        outcome = tune_thread_scheduling(
+            threading.get_native_id(),
+            cpus=None if self._drain_cpu is None else {self._drain_cpu},
+            realtime_priority=self._drain_rt_priority,
+        )
+        # A new drain thread runs per capture; only log when the outcome changes.
+        if outcome != self._drain_tuning:
+            self._drain_tuning = outcome
+            write_log(f"Recorder drain scheduling: {outcome}", self.log_path)
+
     def _drain_queue(self) -> None:
-        while self._running or not self._queue.empty():
-            try:
-                block = self._queue.get(timeout=0.1)
-            except queue.Empty:
-                continue
-            processed = self._prepare_block(block)
+        self._tune_drain_thread()
+        blocks = self._blocks
+        ready = self._blocks_ready
+        # Blocks are coalesced into one SoundFile.write per batch; the pooled
+        # source buffers are only recycled once their batch has been written.
+        pending: list[np.ndarray] = []
+        sources: list[np.ndarray] = []
+        pending_frames = 0
+        while self._running or blocks:
+            woke = ready.wait(timeout=0.1)
+            ready.clear()
+            # Consume everything queued since the last wakeup.
+            while blocks:
+                block, captured_ns = blocks.popleft()
+                processed, rms = self._prepare_block(block)
+                self._accumulate_stats(processed, rms, captured_ns)
+                pending.append(processed)
+                sources.append(block)
+                pending_frames += int(processed.shape[0])
+                if pending_frames >= self._write_batch_frames:
+                    self._flush_pending(pending, sources)
+                    pending_frames = 0
+            if pending and not woke:
+                # Input went quiet; do not hold audio back indefinitely.
+                self._flush_pending(pending, sources)
+                pending_frames = 0
+        self._flush_pending(pending, sources)
+
+    def _flush_pending(self, pending: list[np.ndarray], sources: list[np.ndarray]) -> None:
+        if pending:
+            # Copying into the capture buffer doubles as the batch concatenation,
+            # and frees the pooled sources for reuse.
+            start = len(self._captured)
+            for block in pending:
+                self._captured.append(block)
             if self._writer:
-                self._writer.write(processed)
-            self._accumulate_stats(processed)
-
-    def _prepare_block(self, block: np.ndarray) -> np.ndarray:
-        if self.preamp != 1.0:
-            block = np.clip(block * self.preamp, -1.0, 1.0)
-        return block
-
-    def _accumulate_stats(self, block: np.ndarray) -> None:
+                self._writer.write(_to_pcm16(self._captured.samples(start)))
+        for block in sources:
+            self._pool.release(block)
+        pending.clear()
+        sources.clear()
+
+    def _prepare_block(self, block: np.ndarray) -> tuple[np.ndarray, float]:
+        """Apply the preamp and return `(processed, rms)` for the processed block."""
+        if self.preamp == 1.0:
+            return block, _block_rms(block)
+        if _preamp_clip_sum_sq is not None and block.dtype == np.float32 and block.size:
+            processed = np.empty_like(block)
+            total = _preamp_clip_sum_sq(block.reshape(-1), np.float32(self.preamp), processed.reshape(-1))
+            return processed, math.sqrt(total / block.size)
+        processed = np.clip(block * self.preamp, -1.0, 1.0)
+        return processed, _block_rms(processed)
+
+    def _accumulate_stats(self, block: np.ndarray, rms: float, captured_ns: int) -> None:
         frames = int(block.shape[0]) if block.ndim > 0 else 0
         if frames <= 0:
             return
         block_ms = (frames / self.sample_rate) * 1000.0
-        rms = float(np.sqrt(np.mean(np.square(block), dtype=np.float64)))
 
-        with self._lock:
-            self._total_duration_ms += block_ms
-            self._total_block_count += 1
-            self._max_rms = max(self._max_rms, rms)
-
-            if rms > self.rms_threshold:
-                self._last_audio_time = time.time()
-                self._speech_duration_ms += block_ms
-                self._speech_block_count += 1
-                self._current_speech_streak_ms += block_ms
-                if self._current_speech_streak_ms > self._max_speech_streak_ms:
-                    self._max_speech_streak_ms = self._current_speech_streak_ms
-            else:
-                self._silence_duration_ms += block_ms
-                self._current_speech_streak_ms = 0.0
-                if rms > 0:
-                    self._silence_rms_sum += rms
-                    self._silence_block_count += 1
+        # Only the drain thread touches these counters; stop() reads them after
+        # joining it, so no lock is needed here.
+        self._total_duration_ms += block_ms
+        self._total_block_count += 1
+        if rms > self._max_rms:
+            self._max_rms = rms
+
+        if rms > self.rms_threshold:
+            self._last_audio_time_ns = captured_ns
+            self._speech_duration_ms += block_ms
+            self._speech_block_count += 1
+            self._current_speech_streak_ms += block_ms
+            if self._current_speech_streak_ms > self._max_speech_streak_ms:
+                self._max_speech_streak_ms = self._current_speech_streak_ms
+        else:
+            self._silence_duration_ms += block_ms
+            self._current_speech_streak_ms = 0.0
+            if rms > 0:
+                self._silence_rms_sum += rms
+                self._silence_block_count += 1
 
     def _finalize_stats(self) -> RecorderStats:
         avg_silence_rms: Optional[float] = None
@@ -273,18 +670,7 @@ class Recorder:
 
     def _prepare_writer(self) -> None:
         self._close_writer(remove_file=True)
-        tmp_dir = Path(tempfile.gettempdir()) / "wa_whisper"
-        tmp_dir.mkdir(parents=True, exist_ok=True)
-        fd, filename = tempfile.mkstemp(suffix=".wav", dir=tmp_dir)
-        os.close(fd)
-        self._file = Path(filename)
-        self._writer = sf.SoundFile(
-            str(self._file),
-            mode="w",
-            samplerate=self.sample_rate,
-            channels=1,
-            subtype="PCM_16",
-        )
+        self._file, self._writer = self._wav_pool.acquire()
 
     def _handle_failed_start(self, *, exc: Exception, attempt: int) -> None:
         attempts = self._start_retry_attempts
@@ -292,12 +678,6 @@ class Recorder:
             f"Recorder start failed (attempt {attempt}/{attempts}): {exc}",
             self.log_path,
         )
-        with self._lock:
-            self._running = False
-            self._teardown_stream()
-            self._close_writer(remove_file=True)
-        if attempt < attempts and self._start_retry_delay > 0:
-            time.sleep(self._start_retry_delay)
 
     def _teardown_stream(self) -> None:
         if not self._stream:
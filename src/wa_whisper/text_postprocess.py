@@ -2,25 +2,56 @@
 
 from __future__ import annotations
 
+import functools
 import re
-from typing import Callable, Iterable
+from typing import Any, Callable, Iterable
 
 from word2number import w2n
 
+try:  # Optional DFA-based regex engine (google-re2).
+    import re2
+except ImportError:  # pragma: no cover - optional dependency
+    re2 = None
 
-_NUMBER_WORD_PATTERN = re.compile(
-    r"""
-    (?P<prefix>\b|^)
-    (?P<body>(?:zero|one|two|three|four|five|six|seven|eight|nine|ten|eleven|twelve|
-              thirteen|fourteen|fifteen|sixteen|seventeen|eighteen|nineteen|twenty|
-              thirty|forty|fifty|sixty|seventy|eighty|ninety|hundred|thousand|million|
-              billion|trillion|and|point)(?:[\s-]+(?:zero|one|two|three|four|five|six|
-              seven|eight|nine|ten|eleven|twelve|thirteen|fourteen|fifteen|sixteen|
-              seventeen|eighteen|nineteen|twenty|thirty|forty|fifty|sixty|seventy|
-              eighty|ninety|hundred|thousand|million|billion|trillion|and|point))*)(?P<suffix>\b|$)
-    """,
-    re.IGNORECASE | re.VERBOSE,
+try:  # Optional Aho-Corasick automaton for banned-phrase removal (pyahocorasick).
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional dependency
+    ahocorasick = None
+
+
+_NUMBER_WORDS: tuple[str, ...] = (
+    "zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine",
+    "ten", "eleven", "twelve", "thirteen", "fourteen", "fifteen", "sixteen",
+    "seventeen", "eighteen", "nineteen", "twenty", "thirty", "forty", "fifty",
+    "sixty", "seventy", "eighty", "ninety", "hundred", "thousand", "million",
+    "billion", "trillion", "and", "point",
 )
+_NUMBER_WORD_ALTERNATION = "|".join(_NUMBER_WORDS)
+_NUMBER_WORD_SOURCE = (
+    r"(?i)(?P<prefix>\b|^)"
+    rf"(?P<body>(?:{_NUMBER_WORD_ALTERNATION})(?:[\s-]+(?:{_NUMBER_WORD_ALTERNATION}))*)"
+    r"(?P<suffix>\b|$)"
+)
+
+
+def _compile_number_pattern() -> Any:
+    """Prefer RE2's linear-time automaton; fall back to the stdlib engine."""
+    if re2 is not None:
+        try:
+            return re2.compile(_NUMBER_WORD_SOURCE)
+        except Exception:  # pragma: no cover - unsupported RE2 build
+            pass
+    return re.compile(_NUMBER_WORD_SOURCE)
+
+
+_NUMBER_WORD_PATTERN = _compile_number_pattern()
+
+
+def _may_contain_number_word(text: str) -> bool:
+    """Cheap substring pre-check so number-free text skips the regex scan."""
+    folded = text.casefold()
+    return any(word in folded for word in _NUMBER_WORDS)
+
 
 _BANNED_PHRASES: tuple[str, ...] = (
     "Thank you.",
@@ -28,55 +59,119 @@ _BANNED_PHRASES: tuple[str, ...] = (
     "We\u2019ll be right back.",
 )
 
+# Typographic punctuation Whisper sometimes emits, folded to ASCII in one pass so
+# matching sees a single spelling and xdotool types plain keysyms.
+_NORMALIZE_TABLE = str.maketrans(
+    {
+        "\u2018": "'",
+        "\u2019": "'",
+        "\u201c": '"',
+        "\u201d": '"',
+        "\u2013": "-",
+        "\u2014": "-",
+    }
+)
+# Needles are normalized once here; spellings that fold together (curly vs.
+# straight apostrophe) collapse to a single entry.
+_BANNED_NORMALIZED: tuple[str, ...] = tuple(
+    dict.fromkeys(phrase.translate(_NORMALIZE_TABLE) for phrase in _BANNED_PHRASES)
+)
 
-_SENTENCE_SPLIT_PATTERN = re.compile(r"[.!?]+")
 
+def _build_banned_automaton(phrases: Iterable[str]) -> Any:
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for phrase in phrases:
+        automaton.add_word(phrase, len(phrase))
+    automaton.make_automaton()
+    return automaton
 
-def _word_to_number(fragment: str) -> str:
-    normalized = fragment.replace("-", " ").lower()
+
+_BANNED_AUTOMATON = _build_banned_automaton(_BANNED_NORMALIZED)
+# Fallback without pyahocorasick: one alternation, longest phrase first so a
+# shorter phrase never shadows a longer one that starts at the same position.
+_BANNED_PATTERN = re.compile(
+    "|".join(re.escape(phrase) for phrase in sorted(_BANNED_NORMALIZED, key=len, reverse=True))
+)
+# Matching is case-sensitive, so a phrase can only occur where its first character does.
+_BANNED_LEADS: frozenset[str] = frozenset(phrase[0] for phrase in _BANNED_NORMALIZED)
+
+
+_UNIT_WORDS: tuple[str, ...] = _NUMBER_WORDS[:20]
+_TENS_WORDS: tuple[str, ...] = _NUMBER_WORDS[20:28]
+
+
+def _build_number_table() -> dict[str, str]:
+    """Evaluate the common short phrases once through w2n at import time."""
+    phrases = list(_UNIT_WORDS) + list(_TENS_WORDS)
+    phrases += [f"{tens} {unit}" for tens in _TENS_WORDS for unit in _UNIT_WORDS[1:10]]
+    table: dict[str, str] = {}
+    for phrase in phrases:
+        try:
+            table[phrase] = str(w2n.word_to_num(phrase))
+        except ValueError:
+            continue
+    return table
+
+
+# Units, tens and "tens unit" pairs cover most dictated numbers.
+_NUMBER_TABLE: dict[str, str] = _build_number_table()
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_number_phrase(normalized: str) -> str | None:
     try:
-        value = w2n.word_to_num(normalized)
+        return str(w2n.word_to_num(normalized))
     except ValueError:
-        return fragment
-    return str(value)
+        return None
+
+
+def _word_to_number(fragment: str) -> str:
+    normalized = " ".join(fragment.replace("-", " ").lower().split())
+    value = _NUMBER_TABLE.get(normalized)
+    if value is None:
+        value = _parse_number_phrase(normalized)
+    return fragment if value is None else value
 
 
 def normalize_numbers(text: str) -> str:
     """Convert number words to digits while preserving punctuation."""
+    parts: list[str] = []
+    last = 0
+    for match in _NUMBER_WORD_PATTERN.finditer(text):
+        parts.append(text[last : match.start()])
+        parts.append(_word_to_number(match.group("body")))
+        last = match.end()
+    if not parts:
+        return text
+    parts.append(text[last:])
+    return "".join(parts)
 
-    def replacer(match: re.Match[str]) -> str:
-        prefix = match.group("prefix") or ""
-        body = match.group("body") or ""
-        suffix = match.group("suffix") or ""
-        replacement = _word_to_number(body)
-        return f"{prefix}{replacement}{suffix}"
 
-    return _NUMBER_WORD_PATTERN.sub(replacer, text)
+# Two or more whitespace-delimited single letters, e.g. "f b i".
+_ACRONYM_PATTERN = re.compile(r"(?<!\S)[A-Za-z](?: [A-Za-z])+(?!\S)")
 
 
 def normalize_acronyms(text: str) -> str:
     """Uppercase common acronym patterns (e.g., 'f b i' -> 'FBI')."""
-    tokens = text.split()
-    result: list[str] = []
-    i = 0
-    while i < len(tokens):
-        window: list[str] = []
-        j = i
-        while j < len(tokens) and re.fullmatch(r"[A-Za-z]", tokens[j]):
-            window.append(tokens[j].upper())
-            j += 1
-        if len(window) >= 2:
-            result.append("".join(window))
-            i = j
-        else:
-            result.append(tokens[i])
-            i += 1
-    return " ".join(result)
+    collapsed = " ".join(text.split())
+    parts: list[str] = []
+    last = 0
+    for match in _ACRONYM_PATTERN.finditer(collapsed):
+        start, end = match.span()
+        parts.append(collapsed[last:start])
+        parts.append(collapsed[start:end:2].upper())
+        last = end
+    if not parts:
+        return collapsed
+    parts.append(collapsed[last:])
+    return "".join(parts)
 
 
 def clean_whitespace(text: str) -> str:
     """Collapse repeated whitespace and trim edges."""
-    return re.sub(r"\s+", " ", text).strip()
+    return " ".join(text.split())
 
 
 def remove_literal_phrases(text: str, phrases: Iterable[str]) -> str:
@@ -87,6 +182,48 @@ def remove_literal_phrases(text: str, phrases: Iterable[str]) -> str:
     return clean_whitespace(working)
 
 
+def _scrub(text: str) -> str:
+    """Collapse whitespace and drop banned phrases in a single scan.
+
+    Uses the Aho-Corasick automaton when pyahocorasick is installed and falls
+    back to a single compiled alternation otherwise.
+    """
+    collapsed = " ".join(text.split())
+    if not any(lead in collapsed for lead in _BANNED_LEADS):
+        return collapsed
+    if _BANNED_AUTOMATON is None:
+        return " ".join(_BANNED_PATTERN.sub("", collapsed).split())
+    parts: list[str] = []
+    last = 0
+    # iter_long yields leftmost-longest, non-overlapping matches, so every hit
+    # can be spliced out directly.
+    for end, length in _BANNED_AUTOMATON.iter_long(collapsed):
+        parts.append(collapsed[last : end - length + 1])
+        last = end + 1
+    if not parts:
+        return collapsed
+    parts.append(collapsed[last:])
+    return " ".join("".join(parts).split())
+
+
+_TERMINATORS: frozenset[str] = frozenset(".!?")
+
+
+def _is_single_sentence(text: str) -> bool:
+    """Return True when exactly one non-blank fragment sits between `.!?` runs."""
+    fragments = 0
+    in_fragment = False
+    for char in text:
+        if char in _TERMINATORS:
+            in_fragment = False
+        elif not in_fragment and not char.isspace():
+            fragments += 1
+            if fragments > 1:
+                return False
+            in_fragment = True
+    return fragments == 1
+
+
 def lowercase_single_sentence(text: str, *, reference: str | None = None) -> str:
     """Lowercase the sentence when only one exists and drop its trailing period.
 
@@ -97,10 +234,10 @@ def lowercase_single_sentence(text: str, *, reference: str | None = None) -> str
     if not stripped:
         return stripped
     reference_text = reference.strip() if reference else stripped
-    fragments = [frag for frag in _SENTENCE_SPLIT_PATTERN.split(reference_text) if frag.strip()]
-    if len(fragments) != 1 or not reference_text.endswith("."):
+    # Constant-time checks first; they also bound the sentence scan to 20 chars.
+    if len(reference_text) > 20 or not reference_text.endswith("."):
         return text
-    if len(reference_text) > 20:
+    if not _is_single_sentence(reference_text):
         return text
     lowered = stripped.lower()
     return lowered[:-1]
@@ -110,7 +247,7 @@ def ensure_sentence_final_punctuation(text: str) -> str:
     """Append a period if the sentence lacks terminal punctuation."""
     if not text:
         return text
-    if text[-1] in ".!?":
+    if text[-1] in _TERMINATORS:
         return text
     return f"{text}."
 
@@ -123,13 +260,54 @@ def postprocess_text(
     ensure_punctuation: bool = True,
     append_space: bool = False,
 ) -> str:
-    """Run the configured post-processing passes."""
-    working = text
-    working = clean_whitespace(working)
-    working = remove_literal_phrases(working, _BANNED_PHRASES)
-    if normalize_numbers_enabled:
+    """Run the configured post-processing passes.
+
+    Results are memoized: Whisper repeats short utterances often and every pass
+    is pure.
+    """
+    return _postprocess_cached(
+        text,
+        normalize_numbers_enabled,
+        normalize_acronyms_enabled,
+        ensure_punctuation,
+        append_space,
+    )
+
+
+def postprocess_texts(
+    texts: Iterable[str],
+    *,
+    normalize_numbers_enabled: bool = True,
+    normalize_acronyms_enabled: bool = True,
+    ensure_punctuation: bool = True,
+    append_space: bool = False,
+) -> list[str]:
+    """Post-process a batch of transcripts with the same options.
+
+    Equivalent to calling `postprocess_text` on each item; the options are bound
+    once and the shared automaton, tables and result cache serve every item.
+    """
+    # Positional arguments so single and batch calls share cache entries.
+    options = (normalize_numbers_enabled, normalize_acronyms_enabled, ensure_punctuation, append_space)
+    return [_postprocess_cached(text, *options) for text in texts]
+
+
+@functools.lru_cache(maxsize=4096)
+def _postprocess_cached(
+    text: str,
+    normalize_numbers_enabled: bool,
+    normalize_acronyms_enabled: bool,
+    ensure_punctuation: bool,
+    append_space: bool,
+) -> str:
+    working = _scrub(text.translate(_NORMALIZE_TABLE))
+    if not working:
+        return " " if append_space else working
+    # `working` is already whitespace-collapsed, so each pass can be skipped when
+    # a substring check shows it has nothing to do.
+    if normalize_numbers_enabled and _may_contain_number_word(working):
         working = normalize_numbers(working)
-    if normalize_acronyms_enabled:
+    if normalize_acronyms_enabled and len(working) >= 3 and " " in working:
         working = normalize_acronyms(working)
     reference_before_punct = working
     if ensure_punctuation:
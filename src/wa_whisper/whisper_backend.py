@@ -1,19 +1,30 @@
-"""Wrapper around OpenAI Whisper for wa_whisper."""
+"""Wrappers around OpenAI Whisper and faster-whisper for wa_whisper."""
 
 from __future__ import annotations
 
 import threading
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
+import numpy as np
 import torch
 import whisper
 
+try:  # CTranslate2 runtime for the quantized backend.
+    from faster_whisper import WhisperModel as CT2WhisperModel
+except ImportError:  # pragma: no cover - optional dependency
+    CT2WhisperModel = None
+
 from .log_utils import write_log
 
 DEFAULT_MODEL_NAME = "large-v3"
 DEFAULT_MODEL_CACHE = Path.home() / ".cache" / "huggingface" / "hub"
+WARMUP_SECONDS = 2
+# Sample rate Whisper expects for in-memory audio (both backends).
+WHISPER_SAMPLE_RATE = 16_000
+
+AudioInput = Union[Path, np.ndarray]
 
 
 @dataclass(slots=True)
@@ -33,6 +44,7 @@ class WhisperConfig:
     condition_on_previous_text: bool = False
     cache_dir: Path = DEFAULT_MODEL_CACHE
     device: Optional[str] = None
+    compute_type: Optional[str] = None
 
 
 @dataclass(slots=True)
@@ -56,6 +68,36 @@ class WhisperResult:
     info: Dict[str, Any] = field(default_factory=dict)
 
 
+def _model_input(audio: AudioInput) -> Union[str, np.ndarray]:
+    if isinstance(audio, np.ndarray):
+        return np.ascontiguousarray(audio.reshape(-1), dtype=np.float32)
+    return str(audio)
+
+
+def _describe_audio(audio: AudioInput) -> str:
+    if isinstance(audio, np.ndarray):
+        return f"in-memory capture ({audio.size / WHISPER_SAMPLE_RATE:.2f}s)"
+    return str(audio)
+
+
+def _build_segments(raw_segments: List[Dict[str, Any]]) -> List[WhisperSegment]:
+    """Convert openai-whisper segment dicts into `WhisperSegment` objects."""
+    segments: List[Any] = [None] * len(raw_segments)
+    # Local bindings skip the per-segment method lookups.
+    get = dict.get
+    strip = str.strip
+    for index, seg in enumerate(raw_segments):
+        segments[index] = WhisperSegment(
+            strip(get(seg, "text", "")),
+            float(get(seg, "start", 0.0)),
+            float(get(seg, "end", 0.0)),
+            get(seg, "avg_logprob"),
+            get(seg, "compression_ratio"),
+            get(seg, "no_speech_prob"),
+        )
+    return segments
+
+
 class WhisperBackend:
     """Lazy-loading wrapper that enforces English transcription."""
 
@@ -90,12 +132,28 @@ class WhisperBackend:
                 download_root=str(self._config.cache_dir),
             )
             write_log("Whisper model loaded", self._log_path)
+            if self._device.startswith("cuda"):
+                self._warmup()
 
-    def transcribe(self, audio_path: Path) -> WhisperResult:
-        """Transcribe `audio_path` and return a structured result."""
-        self.load()
-        assert self._model is not None  # Guard for type checkers
+    def _warmup(self) -> None:
+        """Decode a short silent clip so the first real capture skips cold start.
+
+        Whisper pads every input to a fixed 30 s mel window, so the encoder
+        shapes never change and cuDNN's autotuned kernels stay valid. The
+        activation blocks allocated here are retained by PyTorch's caching
+        allocator and reused by later calls.
+        """
+        assert self._model is not None
+        torch.backends.cudnn.benchmark = True
+        silence = np.zeros(WHISPER_SAMPLE_RATE * WARMUP_SECONDS, dtype=np.float32)
+        try:
+            self._model.transcribe(silence, **self._decode_options())
+        except Exception as exc:  # pragma: no cover - warmup is best-effort
+            write_log(f"Whisper warmup failed: {exc}", self._log_path)
+            return
+        write_log("Whisper warmup complete", self._log_path)
 
+    def _decode_options(self) -> Dict[str, Any]:
         kwargs: Dict[str, Any] = {
             "language": "en",
             "task": "transcribe",
@@ -116,24 +174,119 @@ class WhisperBackend:
             kwargs["initial_prompt"] = self._config.initial_prompt
         if self._config.suppress_tokens is not None:
             kwargs["suppress_tokens"] = self._config.suppress_tokens
+        return kwargs
+
+    def transcribe(self, audio: AudioInput) -> WhisperResult:
+        """Transcribe `audio` and return a structured result.
+
+        `audio` is either a file path or mono float32 samples at 16 kHz; the
+        latter skips the ffmpeg decode.
+        """
+        self.load()
+        assert self._model is not None  # Guard for type checkers
+
+        write_log(f"Transcribing {_describe_audio(audio)}", self._log_path)
+        result = self._model.transcribe(_model_input(audio), **self._decode_options())
+
+        segments = _build_segments(result.get("segments", []))
+        text = result.get("text", "").strip()
+        info = {
+            "language": result.get("language"),
+            "duration": result.get("duration"),
+        }
+        return WhisperResult(text=text, segments=segments, info=info)
+
+
+def _parse_suppress_tokens(spec: Optional[str]) -> List[int]:
+    """Convert Whisper's comma-separated token spec into a list of token ids."""
+    if not spec:
+        return []
+    return [int(token) for token in spec.split(",") if token.strip()]
+
+
+class CTranslate2WhisperBackend(WhisperBackend):
+    """faster-whisper (CTranslate2) backend using INT8/FP16 quantized kernels."""
+
+    def _compute_type(self) -> str:
+        if self._config.compute_type:
+            return self._config.compute_type
+        return "int8" if self._device == "cpu" else "int8_float16"
+
+    def load(self) -> None:
+        """Load the CTranslate2 model if it has not been loaded yet."""
+        with self._lock:
+            if self._model is not None:
+                return
+            if CT2WhisperModel is None:
+                raise RuntimeError("faster-whisper not installed; install it to use the ctranslate2 backend.")
+            self._config.cache_dir.mkdir(parents=True, exist_ok=True)
+            device, _, index = self._device.partition(":")
+            compute_type = self._compute_type()
+            write_log(
+                f"Loading faster-whisper model {self._config.model_name} on {self._device} ({compute_type})",
+                self._log_path,
+            )
+            self._model = CT2WhisperModel(
+                self._config.model_name,
+                device=device,
+                device_index=int(index) if index else 0,
+                compute_type=compute_type,
+                download_root=str(self._config.cache_dir),
+            )
+            write_log("faster-whisper model loaded", self._log_path)
 
-        write_log(f"Transcribing {audio_path}", self._log_path)
-        result = self._model.transcribe(str(audio_path), **kwargs)
+    def transcribe(self, audio: AudioInput) -> WhisperResult:
+        """Transcribe `audio` and return a structured result.
 
+        `audio` is either a file path or mono float32 samples at 16 kHz; the
+        latter skips the ffmpeg decode.
+        """
+        self.load()
+        assert self._model is not None  # Guard for type checkers
+
+        kwargs: Dict[str, Any] = {
+            "language": "en",
+            "task": "transcribe",
+            "beam_size": self._config.beam_size,
+            "best_of": self._config.best_of,
+            "temperature": self._config.temperature,
+            "compression_ratio_threshold": self._config.compression_ratio_threshold,
+            "condition_on_previous_text": self._config.condition_on_previous_text,
+            "suppress_tokens": _parse_suppress_tokens(self._config.suppress_tokens),
+        }
+        if self._config.patience is not None:
+            kwargs["patience"] = self._config.patience
+        if self._config.logprob_threshold is not None:
+            kwargs["log_prob_threshold"] = self._config.logprob_threshold
+        if self._config.no_speech_threshold is not None:
+            kwargs["no_speech_threshold"] = self._config.no_speech_threshold
+        if self._config.initial_prompt:
+            kwargs["initial_prompt"] = self._config.initial_prompt
+
+        write_log(f"Transcribing {_describe_audio(audio)}", self._log_path)
+        raw_segments, raw_info = self._model.transcribe(_model_input(audio), **kwargs)
+
+        # faster-whisper decodes lazily; consuming the generator runs inference.
         segments = [
             WhisperSegment(
-                text=seg.get("text", "").strip(),
-                start=float(seg.get("start", 0.0)),
-                end=float(seg.get("end", 0.0)),
-                avg_logprob=seg.get("avg_logprob"),
-                compression_ratio=seg.get("compression_ratio"),
-                no_speech_prob=seg.get("no_speech_prob"),
+                text=seg.text.strip(),
+                start=float(seg.start),
+                end=float(seg.end),
+                avg_logprob=seg.avg_logprob,
+                compression_ratio=seg.compression_ratio,
+                no_speech_prob=seg.no_speech_prob,
             )
-            for seg in result.get("segments", [])
+            for seg in raw_segments
         ]
-        text = result.get("text", "").strip()
+        text = " ".join(seg.text for seg in segments if seg.text)
         info = {
-            "language": result.get("language"),
-            "duration": result.get("duration"),
+            "language": raw_info.language,
+            "duration": raw_info.duration,
         }
         return WhisperResult(text=text, segments=segments, info=info)
+
+
+BACKENDS: Dict[str, type[WhisperBackend]] = {
+    "whisper": WhisperBackend,
+    "ctranslate2": CTranslate2WhisperBackend,
+}
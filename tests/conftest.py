@@ -59,7 +59,15 @@ np_module.sqrt = _sqrt
 np_module.mean = _mean
 np_module.square = _square
 
-sys.modules.setdefault("numpy", np_module)
+try:  # Prefer the real numpy so recorder tests can exercise actual buffers.
+    import numpy  # noqa: F401
+except ImportError:  # pragma: no cover - minimal environments
+    sys.modules.setdefault("numpy", np_module)
+
+if sys.modules["numpy"] is np_module:
+    # Optional accelerators need the real numpy; make them import as missing.
+    for _optional in ("numba", "numpy_rms"):
+        sys.modules.setdefault(_optional, None)
 
 
 sd_module = types.ModuleType("sounddevice")
@@ -93,7 +101,7 @@ sf_module = types.ModuleType("soundfile" )
 
 
 class _SoundFile:
-    def __init__(self, path, mode="w", samplerate=16_000, channels=1, subtype="PCM_16"):
+    def __init__(self, path, mode="w", samplerate=16_000, channels=1, subtype="PCM_16", format=None):
         self.path = Path(path)
         self.mode = mode
         self.samplerate = samplerate
@@ -111,7 +119,10 @@ class _SoundFile:
 
 sf_module.SoundFile = _SoundFile
 
-sys.modules.setdefault("soundfile", sf_module)
+try:  # Prefer the real soundfile so recorder tests can read back actual WAVs.
+    import soundfile  # noqa: F401
+except (ImportError, OSError):  # pragma: no cover - missing package or libsndfile
+    sys.modules.setdefault("soundfile", sf_module)
 
 
 w2n_module = types.ModuleType("word2number")
@@ -0,0 +1,95 @@
+import threading
+
+from pynput import keyboard
+
+from wa_whisper.hotkeys import PushToTalkHotkey, _MuteStateCache
+from wa_whisper.recorder import RecorderStartError
+
+
+def test_mute_state_cache_hits_within_ttl():
+    cache = _MuteStateCache(ttl=60.0)
+
+    assert cache.get("sink") == (False, None)
+    cache.put("sink", False)
+
+    assert cache.get("sink") == (True, False)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_mute_state_cache_expires_and_invalidates(monkeypatch):
+    now = {"value": 100.0}
+    monkeypatch.setattr("wa_whisper.hotkeys.time.monotonic", lambda: now["value"])
+    cache = _MuteStateCache(ttl=5.0)
+
+    cache.put("sink", True)
+    now["value"] += 6.0
+    assert cache.get("sink") == (False, None)
+
+    cache.put("sink", True)
+    cache.invalidate("sink")
+    assert cache.get("sink") == (False, None)
+
+
+def test_mute_state_cache_ignores_self_triggered_sink_events(monkeypatch):
+    now = {"value": 100.0}
+    monkeypatch.setattr("wa_whisper.hotkeys.time.monotonic", lambda: now["value"])
+    cache = _MuteStateCache(ttl=60.0)
+    cache.put("sink", False)
+
+    cache.suppress_events(0.5)
+    assert cache.handle_sink_event() is False
+    assert cache.get("sink") == (True, False)
+
+    now["value"] += 1.0
+    assert cache.handle_sink_event() is True
+    assert cache.get("sink") == (False, None)
+
+
+class _SlowFailingRecorder:
+    """First start() blocks until released and then fails; later starts succeed."""
+
+    def __init__(self):
+        self.release_first = threading.Event()
+        self.starts = 0
+        self.running = False
+
+    def start(self):
+        self.starts += 1
+        if self.starts == 1:
+            self.release_first.wait(timeout=5.0)
+            raise RecorderStartError("device busy", attempts=1)
+        self.running = True
+        return "capture.wav"
+
+    def stop(self, _timeout):
+        self.running = False
+        return None
+
+    def last_capture_stats(self):
+        return None
+
+
+def test_stale_press_failure_does_not_swallow_newer_release(tmp_path):
+    recorder = _SlowFailingRecorder()
+    finished = threading.Semaphore(0)
+    hotkey = PushToTalkHotkey(
+        recorder,
+        silence_timeout=0.0,
+        on_capture_finished=lambda *_: finished.release(),
+        log_path=tmp_path / "log.txt",
+        enable_audio_mute=False,
+    )
+    hotkey.start()
+    try:
+        hotkey._handle_press(keyboard.Key.alt_r)
+        hotkey._handle_release(keyboard.Key.alt_r)
+        hotkey._handle_press(keyboard.Key.alt_r)
+        recorder.release_first.set()
+        assert finished.acquire(timeout=5.0)
+
+        hotkey._handle_release(keyboard.Key.alt_r)
+        assert finished.acquire(timeout=5.0)
+        assert recorder.starts == 2
+        assert not recorder.running
+    finally:
+        hotkey.stop()
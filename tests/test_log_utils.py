@@ -0,0 +1,34 @@
+import re
+
+from wa_whisper.log_utils import flush_log, write_log
+
+
+def test_write_log_appends_timestamped_lines_in_order(tmp_path):
+    log_path = tmp_path / "nested" / "log.txt"
+
+    write_log("first", log_path)
+    write_log("second", log_path)
+    assert flush_log(timeout=2.0)
+
+    lines = log_path.read_text(encoding="utf-8").splitlines()
+    assert [line.split(" ", 1)[1] for line in lines] == ["first", "second"]
+    assert re.fullmatch(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z", lines[0].split(" ", 1)[0])
+
+
+def test_format_timestamp_matches_iso_utc_and_tracks_seconds():
+    from wa_whisper.log_utils import _format_timestamp
+
+    assert _format_timestamp(0.2) == "1970-01-01T00:00:00Z"
+    assert _format_timestamp(0.9) == "1970-01-01T00:00:00Z"
+    assert _format_timestamp(61.0) == "1970-01-01T00:01:01Z"
+
+
+def test_write_log_timestamps_each_line_of_multiline_message(tmp_path):
+    log_path = tmp_path / "log.txt"
+
+    write_log("header\nstats", log_path)
+    assert flush_log(timeout=2.0)
+
+    lines = log_path.read_text(encoding="utf-8").splitlines()
+    assert [line.split(" ", 1)[1] for line in lines] == ["header", "stats"]
+    assert lines[0].split(" ", 1)[0] == lines[1].split(" ", 1)[0]
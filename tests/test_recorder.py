@@ -1,11 +1,9 @@
-import sys
+import os
 import time
 from pathlib import Path
 
 import pytest
 
-sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
-
 try:  # pragma: no cover - fallback for test environments without sounddevice
     import sounddevice as sd  # type: ignore
 except ModuleNotFoundError:  # pragma: no cover
@@ -17,34 +15,57 @@ except ModuleNotFoundError:  # pragma: no cover
 
     sd = _SDModule()  # type: ignore
 
-from wa_whisper.recorder import Recorder, RecorderStartError
+from wa_whisper.recorder import Recorder, RecorderStartError, _block_rms, _to_pcm16
 
 
-def _make_recorder(tmp_path: Path, monkeypatch, *, fail_attempts: int, sleep: float = 0.0) -> Recorder:
-    counter = {"remaining": fail_attempts}
+class SequencedStream:
+    def __init__(self, *, callback, counter, **_kwargs):
+        self.callback = callback
+        self.counter = counter
+        self.stopped = False
 
-    class SequencedStream:
-        def __init__(self, *, callback, **_kwargs):
-            self.callback = callback
-            self.stopped = False
+    def start(self):
+        if self.counter["remaining"] > 0:
+            self.counter["remaining"] -= 1
+            raise sd.PortAudioError("Stream start failed", self.counter["code"])
 
-        def start(self):
-            if counter["remaining"] > 0:
-                counter["remaining"] -= 1
-                raise sd.PortAudioError("Wait timed out", -9987)
+    def stop(self):
+        self.stopped = True
 
-        def stop(self):
-            self.stopped = True
+    def close(self):
+        self.stopped = True
 
-        def close(self):
-            self.stopped = True
 
-    def stream_factory(**kwargs):
-        if sleep:
-            time.sleep(sleep)
-        return SequencedStream(**kwargs)
+@pytest.fixture(scope="module")
+def stream_counter():
+    """Patch `sd.InputStream` once per module; tests only reset the counter."""
+    counter = {"remaining": 0, "sleep": 0.0, "calls": 0, "code": -9987}
 
-    monkeypatch.setattr("wa_whisper.recorder.sd.InputStream", stream_factory)
+    def stream_factory(**kwargs):
+        counter["calls"] += 1
+        if counter["sleep"]:
+            time.sleep(counter["sleep"])
+        counter["stream"] = SequencedStream(counter=counter, **kwargs)
+        return counter["stream"]
+
+    with pytest.MonkeyPatch.context() as patcher:
+        patcher.setattr("wa_whisper.recorder.sd.InputStream", stream_factory)
+        yield counter
+
+
+def _make_recorder(
+    tmp_path: Path,
+    monkeypatch,
+    stream_counter,
+    *,
+    fail_attempts: int,
+    sleep: float = 0.0,
+    error_code: int = -9987,
+) -> Recorder:
+    stream_counter["remaining"] = fail_attempts
+    stream_counter["sleep"] = sleep
+    stream_counter["calls"] = 0
+    stream_counter["code"] = error_code
     monkeypatch.setattr("wa_whisper.recorder.tempfile.gettempdir", lambda: str(tmp_path))
     log_path = tmp_path / "log.txt"
     return Recorder(
@@ -56,21 +77,124 @@ def _make_recorder(tmp_path: Path, monkeypatch, *, fail_attempts: int, sleep: fl
     )
 
 
-def test_recorder_start_raises_after_retries(tmp_path, monkeypatch):
-    recorder = _make_recorder(tmp_path, monkeypatch, fail_attempts=3)
+def test_recorder_start_raises_after_retries(tmp_path, monkeypatch, stream_counter):
+    recorder = _make_recorder(tmp_path, monkeypatch, stream_counter, fail_attempts=3)
 
     with pytest.raises(RecorderStartError):
         recorder.start()
+    recorder.close()
 
     temp_dir = tmp_path / "wa_whisper"
-    assert not list(temp_dir.glob("*.wav"))
+    if temp_dir.is_dir():
+        with os.scandir(temp_dir) as entries:
+            assert not any(entry.name.endswith(".wav") for entry in entries)
     assert recorder.last_capture_stats() is None
 
 
-def test_recorder_start_recovers_after_transient_failure(tmp_path, monkeypatch):
-    recorder = _make_recorder(tmp_path, monkeypatch, fail_attempts=1)
+def test_recorder_start_recovers_after_transient_failure(tmp_path, monkeypatch, stream_counter):
+    recorder = _make_recorder(tmp_path, monkeypatch, stream_counter, fail_attempts=1)
 
     path = recorder.start()
 
     assert path.exists()
     assert recorder.last_capture_stats() is None
+    recorder.stop(0.0)
+    recorder.close()
+
+
+@pytest.mark.parametrize(
+    ("error_code", "expected_streams"),
+    [(-9987, 1), (-9985, 2)],
+    ids=["timeout-retries-same-stream", "device-unavailable-reopens"],
+)
+def test_recorder_start_reopens_only_for_device_errors(
+    tmp_path, monkeypatch, stream_counter, error_code, expected_streams
+):
+    recorder = _make_recorder(
+        tmp_path, monkeypatch, stream_counter, fail_attempts=1, error_code=error_code
+    )
+
+    recorder.start()
+
+    assert stream_counter["calls"] == expected_streams
+    recorder.stop(0.0)
+    recorder.close()
+
+
+def test_recorder_keeps_captured_audio_in_memory(tmp_path, monkeypatch, stream_counter):
+    np = pytest.importorskip("numpy")
+    sf = pytest.importorskip("soundfile")
+    if not hasattr(np, "concatenate") or not hasattr(sf, "read"):
+        pytest.skip("needs the real numpy and soundfile")
+    recorder = _make_recorder(tmp_path, monkeypatch, stream_counter, fail_attempts=0)
+    recorder.start()
+    rng = np.random.default_rng(0)
+    blocks = [rng.uniform(-0.5, 0.5, size=(512, 1)).astype(np.float32) for _ in range(8)]
+
+    for block in blocks:
+        stream_counter["stream"].callback(block, len(block), None, None)
+    path = recorder.stop(0.0)
+    recorder.close()
+
+    audio = recorder.last_capture_audio()
+    expected = np.concatenate(blocks).reshape(-1)
+    assert audio is not None
+    np.testing.assert_array_equal(audio.reshape(-1), expected)
+    written, _ = sf.read(path, dtype="int16")
+    np.testing.assert_array_equal(_to_pcm16(audio).reshape(-1), written)
+
+
+@pytest.mark.parametrize("kernel", ["numpy_rms", "numba", "numpy"])
+def test_block_rms_of_empty_block_is_zero(monkeypatch, kernel):
+    np = pytest.importorskip("numpy")
+    if not hasattr(np, "zeros"):
+        pytest.skip("needs the real numpy")
+
+    class _StubNumpyRms:
+        @staticmethod
+        def rms(data, window_size):
+            # Mirrors numpy-rms: one value per full window, none for empty input.
+            return np.sqrt(np.mean(np.square(data))).reshape(1) if len(data) else data[:0]
+
+    monkeypatch.setattr(
+        "wa_whisper.recorder.numpy_rms", _StubNumpyRms if kernel == "numpy_rms" else None
+    )
+    if kernel != "numba":
+        monkeypatch.setattr("wa_whisper.recorder._sum_of_squares", None)
+
+    assert _block_rms(np.zeros((0, 1), dtype=np.float32)) == 0.0
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        1.0,
+        -1.0,
+        1.5,
+        -1.5,
+        0.0,
+        -0.0,
+        float("nan"),
+        float("inf"),
+        float("-inf"),
+        1 / 32768,
+        -1 / 32768,
+        0.5 / 32768,
+        -0.5 / 32768,
+        32767.5 / 32768,
+        1e-9,
+        -1e-9,
+    ],
+)
+def test_to_pcm16_matches_libsndfile(tmp_path, value):
+    np = pytest.importorskip("numpy")
+    sf = pytest.importorskip("soundfile")
+    if not hasattr(np, "float32") or not hasattr(sf, "read"):
+        pytest.skip("needs the real numpy and soundfile")
+    block = np.full(4, value, dtype=np.float32)
+    path = tmp_path / "ref.wav"
+    sf.write(path, block, 16_000, subtype="PCM_16", format="WAV")
+
+    expected, _ = sf.read(path, dtype="int16")
+
+    np.testing.assert_array_equal(_to_pcm16(block), expected)
@@ -1,43 +1,88 @@
 """Tests for the text post-processing helpers."""
 
-from wa_whisper.text_postprocess import postprocess_text
-
-
-def test_banned_phrases_are_removed_case_sensitive() -> None:
-    text = "Start. Thank you."
-    assert postprocess_text(text) == "start"
-
-
-def test_lowercases_single_sentence_and_drops_period() -> None:
-    text = "THIS IS A TEST."
-    assert postprocess_text(text) == "this is a test"
-
-
-def test_single_sentence_longer_than_threshold_keeps_case() -> None:
-    text = "This sentence is definitely longer."
-    assert postprocess_text(text) == "This sentence is definitely longer."
-
-
-def test_question_sentence_keeps_question_mark() -> None:
-    text = "Is This Working?"
-    assert postprocess_text(text) == "Is This Working?"
-
-
-def test_multiple_sentences_remain_unchanged_by_lowercase_rule() -> None:
-    text = "First sentence. Second sentence."
-    assert postprocess_text(text) == "First sentence. Second sentence."
-
-
-def test_paragraph_without_punctuation_keeps_appended_period() -> None:
-    text = "This is sentence one this is sentence two"
-    assert postprocess_text(text) == "This is sentence one this is sentence two."
-
-
-def test_curly_apostrophe_phrase_is_removed() -> None:
-    text = "We\u2019ll be right back. Resume normal service."
-    assert postprocess_text(text) == "Resume normal service."
-
-
-def test_single_sentence_without_period_is_unchanged() -> None:
-    text = "One sentence only"
-    assert postprocess_text(text, ensure_punctuation=False) == "One sentence only"
+import pytest
+
+from wa_whisper import text_postprocess
+from wa_whisper.text_postprocess import normalize_acronyms, postprocess_text, postprocess_texts
+
+
+@pytest.mark.parametrize(
+    ("text", "expected", "kwargs"),
+    [
+        pytest.param("Start. Thank you.", "start", {}, id="banned_phrases_are_removed_case_sensitive"),
+        pytest.param("THIS IS A TEST.", "this is a test", {}, id="lowercases_single_sentence_and_drops_period"),
+        pytest.param(
+            "This sentence is definitely longer.",
+            "This sentence is definitely longer.",
+            {},
+            id="single_sentence_longer_than_threshold_keeps_case",
+        ),
+        pytest.param("Is This Working?", "Is This Working?", {}, id="question_sentence_keeps_question_mark"),
+        pytest.param(
+            "First sentence. Second sentence.",
+            "First sentence. Second sentence.",
+            {},
+            id="multiple_sentences_remain_unchanged_by_lowercase_rule",
+        ),
+        pytest.param(
+            "This is sentence one this is sentence two",
+            "This is sentence one this is sentence two.",
+            {},
+            id="paragraph_without_punctuation_keeps_appended_period",
+        ),
+        pytest.param(
+            "We\u2019ll be right back. Resume normal service.",
+            "Resume normal service.",
+            {},
+            id="curly_apostrophe_phrase_is_removed",
+        ),
+        pytest.param(
+            "One sentence only",
+            "One sentence only",
+            {"ensure_punctuation": False},
+            id="single_sentence_without_period_is_unchanged",
+        ),
+        pytest.param(
+            "\u201cIt\u2019s fine\u201d \u2014 really, it is.",
+            "\"It's fine\" - really, it is.",
+            {},
+            id="typographic_punctuation_is_normalized",
+        ),
+    ],
+)
+def test_postprocess_text(text: str, expected: str, kwargs: dict) -> None:
+    assert postprocess_text(text, **kwargs) == expected
+
+
+def test_spelled_letters_collapse_into_acronym() -> None:
+    text = "the  f b i agent met the   u n rep i."
+    assert normalize_acronyms(text) == "the FBI agent met the UN rep i."
+
+
+def test_postprocess_texts_matches_single_calls() -> None:
+    texts = ["THIS IS A TEST.", "Start. Thank you.", "", "Is This Working?"]
+    assert postprocess_texts(texts, append_space=True) == [
+        postprocess_text(text, append_space=True) for text in texts
+    ]
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        pytest.param("Thank Thank you. you.", "Thank you.", id="overlapping_phrase_prefix"),
+        pytest.param("Thanks for watching!Thank you.", "", id="shared_prefix_back_to_back"),
+        pytest.param("Thank you.Thank you.", "", id="same_phrase_back_to_back"),
+        pytest.param(
+            "Thank you.Thanks for watching!We'll be right back.", "", id="all_phrases_back_to_back"
+        ),
+        pytest.param("I said Thank you. to him and left.", "I said to him and left.", id="mid_sentence"),
+        pytest.param("Thanks for watching!! Thank you..", "! .", id="trailing_punctuation_survives"),
+    ],
+)
+def test_banned_phrase_fallback_matches_automaton(monkeypatch, text: str, expected: str) -> None:
+    if text_postprocess._BANNED_AUTOMATON is None:
+        pytest.skip("pyahocorasick is not installed")
+    assert text_postprocess._scrub(text) == expected
+
+    monkeypatch.setattr(text_postprocess, "_BANNED_AUTOMATON", None)
+    assert text_postprocess._scrub(text) == expected